@@ -15,6 +15,7 @@ CLI usage:
 from __future__ import annotations
 
 import argparse
+import os
 import sys
 from pathlib import Path
 from typing import Sequence
@@ -43,14 +44,42 @@ except ImportError:
 INPUT_IMAGE_FORMATS = ["jpg", "jpeg", "png", "webp", "tiff", "tif", "bmp", "gif"]
 OUTPUT_IMAGE_FORMATS = ["png", "jpg", "jpeg", "webp", "tiff"]
 
-# Page sizes in points (72 points = 1 inch)
-PAGE_SIZES = {
-    "a4": fitz.paper_size("a4"),           # 595 x 842
-    "letter": fitz.paper_size("letter"),   # 612 x 792
-    "legal": fitz.paper_size("legal"),     # 612 x 1008
-    "a3": fitz.paper_size("a3"),           # 842 x 1191
-    "a5": fitz.paper_size("a5"),           # 420 x 595
-    "fit": None,                            # Special: fit to image size
+# Page sizes in points (72 points = 1 inch), keyed by lowercase name:
+# a4 595x842, letter 612x792, legal 612x1008, a3 842x1191, a5 420x595
+PAGE_SIZES: dict[str, tuple[float, float] | None] = {
+    k: fitz.paper_size(k) for k in ("a4", "letter", "legal", "a3", "a5")
+}
+PAGE_SIZES["fit"] = None  # Special: fit to image size
+
+# Same sizes normalized to (short, long) so orientation is a tuple index
+_PAGE_SIZES_SORTED: dict[str, tuple[float, float] | None] = {
+    k: ((min(v), max(v)) if v else None) for k, v in PAGE_SIZES.items()
+}
+
+_MISSING = object()
+
+# Output images are written with a single buffered write per file
+_WRITE_BUFFER_SIZE = 1 << 20
+
+# (clockwise rotation, flip_h, flip_v) -> the single PIL transpose that
+# produces the same image, so orthogonal transforms take one pixel pass
+_ORTHOGONAL_TRANSPOSE: dict[tuple[int, bool, bool], str | None] = {
+    (0, False, False): None,
+    (0, False, True): "FLIP_TOP_BOTTOM",
+    (0, True, False): "FLIP_LEFT_RIGHT",
+    (0, True, True): "ROTATE_180",
+    (90, False, False): "ROTATE_270",
+    (90, False, True): "TRANSVERSE",
+    (90, True, False): "TRANSPOSE",
+    (90, True, True): "ROTATE_90",
+    (180, False, False): "ROTATE_180",
+    (180, False, True): "FLIP_LEFT_RIGHT",
+    (180, True, False): "FLIP_TOP_BOTTOM",
+    (180, True, True): None,
+    (270, False, False): "ROTATE_90",
+    (270, False, True): "TRANSPOSE",
+    (270, True, False): "TRANSVERSE",
+    (270, True, True): "ROTATE_270",
 }
 
 
@@ -107,13 +136,11 @@ def images_to_pdf(
     # Convert margin from mm to points (1 mm = 2.834645669 points)
     margin_pt = margin_mm * 2.834645669
 
-    # Get base page size
-    size_key = page_size.lower()
-    if size_key not in PAGE_SIZES:
+    # Get base page size as (short, long) side
+    base_size = _PAGE_SIZES_SORTED.get(page_size.lower(), _MISSING)
+    if base_size is _MISSING:
         raise ConversionError("images", "pdf", f"Unknown page size: {page_size}")
 
-    base_size = PAGE_SIZES[size_key]
-
     try:
         doc = fitz.open()
         temp_files: list[Path] = []
@@ -126,7 +153,7 @@ def images_to_pdf(
             # Check if we need PIL processing:
             # 1. Transforms are needed (rotation, flip)
             # 2. File is webp (PyMuPDF can't open webp directly)
-            suffix = img_path.suffix if hasattr(img_path, 'suffix') else Path(str(img_path)).suffix
+            suffix = img_path.suffix  # validate_files_exist returns Path objects
             is_webp = suffix.lower() == '.webp'
             needs_transform = transform and (transform.get("rotation") or transform.get("flip_h") or transform.get("flip_v"))
 
@@ -134,20 +161,26 @@ def images_to_pdf(
                 from PIL import Image
                 import tempfile
 
-                pil_img = Image.open(str(img_path))
+                pil_img = Image.open(img_path)
 
-                # Apply rotation if needed
                 if needs_transform:
-                    rotation = transform.get("rotation", 0)
-                    if rotation:
+                    rotation = transform.get("rotation") or 0
+                    flip_h = bool(transform.get("flip_h"))
+                    flip_v = bool(transform.get("flip_v"))
+                    key = (rotation % 360, flip_h, flip_v)
+
+                    if key in _ORTHOGONAL_TRANSPOSE:
+                        # Rotation and flips collapse into one transpose
+                        method = _ORTHOGONAL_TRANSPOSE[key]
+                        if method:
+                            pil_img = pil_img.transpose(Image.Transpose[method])
+                    else:
                         # PIL rotates counter-clockwise, we want clockwise
                         pil_img = pil_img.rotate(-rotation, expand=True)
-
-                    # Apply flips
-                    if transform.get("flip_h"):
-                        pil_img = pil_img.transpose(Image.FLIP_LEFT_RIGHT)
-                    if transform.get("flip_v"):
-                        pil_img = pil_img.transpose(Image.FLIP_TOP_BOTTOM)
+                        if flip_h:
+                            pil_img = pil_img.transpose(Image.FLIP_LEFT_RIGHT)
+                        if flip_v:
+                            pil_img = pil_img.transpose(Image.FLIP_TOP_BOTTOM)
 
                 # Save to temp file - always use PNG for webp since PyMuPDF doesn't support webp
                 out_suffix = '.png' if is_webp else suffix
@@ -159,12 +192,21 @@ def images_to_pdf(
                 if pil_img.mode == 'RGBA' and out_suffix.lower() in ['.jpg', '.jpeg']:
                     pil_img = pil_img.convert('RGB')
 
-                pil_img.save(str(temp_path))
+                pil_img.save(temp_path)
                 pil_img.close()
                 actual_img_path = temp_path
 
-            # Open image to get dimensions
-            img_doc = fitz.open(str(actual_img_path))
+            # JPEGs that need no transform are handed to MuPDF as a buffer so
+            # the file is read once and embedded verbatim as DCTDecode
+            img_stream: bytes | None = None
+            if actual_img_path is img_path and suffix.lower() in ('.jpg', '.jpeg'):
+                img_stream = img_path.read_bytes()
+
+            # Open image to get dimensions (header only, no pixel decode)
+            if img_stream is not None:
+                img_doc = fitz.open(stream=img_stream, filetype="jpeg")
+            else:
+                img_doc = fitz.open(os.fspath(actual_img_path))
             img_page = img_doc[0]
             img_rect_orig = img_page.rect
             img_width = img_rect_orig.width
@@ -190,11 +232,9 @@ def images_to_pdf(
                     is_landscape = False
 
                 if is_landscape:
-                    page_width = max(base_size[0], base_size[1])
-                    page_height = min(base_size[0], base_size[1])
+                    page_height, page_width = base_size
                 else:
-                    page_width = min(base_size[0], base_size[1])
-                    page_height = max(base_size[0], base_size[1])
+                    page_width, page_height = base_size
 
             # Create new page
             page = doc.new_page(width=page_width, height=page_height)
@@ -223,7 +263,10 @@ def images_to_pdf(
             )
 
             # Insert image
-            page.insert_image(img_rect, filename=str(actual_img_path))
+            if img_stream is not None:
+                page.insert_image(img_rect, stream=img_stream)
+            else:
+                page.insert_image(img_rect, filename=os.fspath(actual_img_path))
             img_doc.close()
 
         # Save with compression
@@ -305,39 +348,41 @@ def pdf_to_images(
         matrix = fitz.Matrix(zoom, zoom)
 
         output_paths: list[Path] = []
+        out_dir_str = os.fspath(out_dir)
 
         for idx in page_indices:
             if idx < 0 or idx >= total_pages:
                 continue
 
             page = doc[idx]
-            pix = page.get_pixmap(matrix=matrix)
+            pix = page.get_pixmap(matrix=matrix, alpha=False)
 
             # Determine output path
             page_num = idx + 1  # 1-indexed for filename
-            filename = f"{prefix}_{page_num:04d}.{fmt}"
-            out_path = out_dir / filename
-
-            # Save based on format
-            if fmt == "png":
-                pix.save(str(out_path))
-            elif fmt in ("jpg", "jpeg"):
-                pix.save(str(out_path), jpg_quality=95)
-            elif fmt == "webp":
-                # PyMuPDF doesn't support webp directly, use PIL
-                from PIL import Image
-                import io
-                img_data = pix.tobytes("png")
-                img = Image.open(io.BytesIO(img_data))
-                img.save(str(out_path), "WEBP", quality=95)
-            elif fmt == "tiff":
-                from PIL import Image
-                import io
-                img_data = pix.tobytes("png")
-                img = Image.open(io.BytesIO(img_data))
-                img.save(str(out_path), "TIFF")
-
-            output_paths.append(out_path)
+            out_path_str = f"{out_dir_str}/{prefix}_{page_num:04d}.{fmt}"
+
+            # Save based on format through one large buffered write
+            with open(out_path_str, "wb", buffering=_WRITE_BUFFER_SIZE) as fh:
+                if fmt == "png":
+                    fh.write(pix.tobytes("png"))
+                elif fmt in ("jpg", "jpeg"):
+                    fh.write(pix.tobytes("jpg", jpg_quality=95))
+                elif fmt == "webp":
+                    # PyMuPDF doesn't support webp directly, use PIL
+                    from PIL import Image
+                    import io
+                    img_data = pix.tobytes("png")
+                    img = Image.open(io.BytesIO(img_data))
+                    img.save(fh, "WEBP", quality=95)
+                elif fmt == "tiff":
+                    from PIL import Image
+                    import io
+                    img_data = pix.tobytes("png")
+                    img = Image.open(io.BytesIO(img_data))
+                    img.save(fh, "TIFF")
+                _drop_from_page_cache(fh)
+
+            output_paths.append(Path(out_path_str))
 
         doc.close()
         return output_paths
@@ -346,6 +391,26 @@ def pdf_to_images(
         raise ConversionError("pdf", format, str(e)) from e
 
 
+def _drop_from_page_cache(fh) -> None:
+    """
+    Flush a written file and advise the OS not to keep it cached.
+
+    Rendered images are not read back, so on large documents they would
+    only push useful data out of the page cache. No-op where
+    ``posix_fadvise`` is unavailable (Windows, macOS).
+
+    Args:
+        fh: Open binary file object
+    """
+    if not hasattr(os, "posix_fadvise"):
+        return
+    fh.flush()
+    try:
+        os.posix_fadvise(fh.fileno(), 0, 0, os.POSIX_FADV_DONTNEED)
+    except OSError:
+        pass  # Advisory only
+
+
 def _parse_page_range(range_str: str, total_pages: int) -> list[int]:
     """
     Parse a page range string into a list of 0-indexed page numbers.
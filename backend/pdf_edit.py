@@ -13,21 +13,81 @@ CLI usage (dev):
 from __future__ import annotations
 
 import argparse
+import heapq
+import os
+import re
 import sys
 import json
-import base64
 import io
 import math
+import shutil
 import subprocess
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from functools import lru_cache
+from operator import itemgetter
 from pathlib import Path
-from typing import Optional, Tuple
+from types import MappingProxyType
+from typing import Iterable, Iterator, Optional, Tuple
 
-import fitz  # PyMuPDF
+
+class _LazyFitz:
+    """
+    Stand-in for the fitz module until PyMuPDF is first needed.
+
+    Importing PyMuPDF dominates startup, so library users and `--help`
+    only pay for it once a function actually touches a document. The
+    first attribute access imports it and rebinds the module global, so
+    later lookups go straight to the real module.
+    """
+
+    def __getattr__(self, name):
+        global fitz
+        import fitz as pymupdf
+
+        fitz = pymupdf
+        return getattr(pymupdf, name)
+
+
+fitz = _LazyFitz()  # PyMuPDF, imported on first use
+
+try:
+    from utils import file_cache_key, get_cache_dir, is_same_file, prune_cache_dir, write_cache_file
+except ImportError:
+    from .utils import file_cache_key, get_cache_dir, is_same_file, prune_cache_dir, write_cache_file
+
+try:
+    import pybase64 as base64  # SIMD-accelerated, same API
+except ImportError:
+    import base64
+
+try:
+    import orjson  # Faster JSON for edit ops and CLI results
+except ImportError:
+    orjson = None
+
+try:
+    from rapidfuzz import fuzz, process as fuzz_process  # Graded font-name matching
+except ImportError:
+    fuzz = None
 
 
 # Cache for system font lookups (font_name -> font_file_path or None)
 _font_cache: dict[str, Optional[str]] = {}
 
+# Size budget for the on-disk text block cache
+_TEXT_BLOCKS_CACHE_MAX_BYTES = 64 * 1024 * 1024
+# Part of the cache key: bump when SpanRecord or the result layout changes
+_TEXT_BLOCKS_CACHE_VERSION = 2
+
+# PyMuPDF span font flags
+_FLAG_SUPER = 1 << 0   # superscript
+_FLAG_ITALIC = 1 << 1  # italic
+_FLAG_SERIF = 1 << 2   # serifed
+_FLAG_MONO = 1 << 3    # monospaced
+_FLAG_BOLD = 1 << 4    # bold
+
 
 def find_system_font(font_name: str) -> Optional[str]:
     """
@@ -89,15 +149,171 @@ def get_font_for_insert(css_font: str) -> Tuple[str, Optional[str]]:
     return (parse_css_font_family(css_font), None)
 
 
+# Set by serve(): read-only commands then share open documents across requests
+_document_cache_enabled = False
+
+
+@lru_cache(maxsize=8)
+def _open_cached_document(path: str, mtime_ns: int) -> fitz.Document:
+    """Open a document once per (path, mtime); a changed file gets a new key."""
+    return fitz.open(path)
+
+
+def _open_document(input_path: Path) -> fitz.Document:
+    """Open a document for read-only use, reusing the handle in serve mode."""
+    if _document_cache_enabled:
+        path = os.path.abspath(input_path)
+        return _open_cached_document(path, os.stat(path).st_mtime_ns)
+    return fitz.open(input_path)
+
+
+def _release_document(doc: fitz.Document) -> None:
+    """Close a document from _open_document unless the serve cache owns it."""
+    if not _document_cache_enabled:
+        doc.close()
+
+
+def _page_has_text(page: fitz.Page) -> bool:
+    """
+    Cheap check for whether a page can contain any text.
+
+    Text needs a font, so a page whose resources (including form
+    XObjects) reference no fonts is image-only or blank. This only reads
+    the resource dictionaries and never parses the content stream.
+    """
+    return bool(page.get_fonts())
+
+
+def _new_block_data(
+    page_num: int,
+    index: int,
+    bbox,
+    page_width: float,
+    page_height: float,
+) -> dict:
+    """Build the block record shared by the detailed and summary paths."""
+    return {
+        "id": f"block_{page_num}_{index}",
+        "bbox": {
+            "x0": bbox[0],
+            "y0": bbox[1],
+            "x1": bbox[2],
+            "y1": bbox[3],
+        },
+        # Normalized coordinates (0-1) for frontend
+        "rect": {
+            "x": bbox[0] / page_width,
+            "y": bbox[1] / page_height,
+            "width": (bbox[2] - bbox[0]) / page_width,
+            "height": (bbox[3] - bbox[1]) / page_height,
+        },
+        "lines": [],
+    }
+
+
+def _extract_blocks_from_page(
+    page: fitz.Page,
+    page_num: int,
+    spans: bool = True,
+) -> list[dict]:
+    """
+    Extract text blocks from an already-opened page.
+
+    Shared by get_text_blocks and get_all_text_blocks so a multi-page
+    extraction parses the document once instead of once per page.
+
+    With spans=False only block geometry and text are returned (``lines``
+    is empty), using the flat "blocks" extraction which skips building
+    per-span font details.
+    """
+    # Image-only or blank pages: skip the expensive dict extraction
+    if not _page_has_text(page):
+        return []
+
+    # Page size is fixed per page; read the rect once, not per block
+    page_rect = page.rect
+    page_width = page_rect.width
+    page_height = page_rect.height
+    blocks = []
+
+    if not spans:
+        raw_blocks = page.get_text("blocks", flags=fitz.TEXT_PRESERVE_WHITESPACE)
+        for x0, y0, x1, y1, text, _block_no, block_type in raw_blocks:
+            # Skip image blocks
+            if block_type != 0:
+                continue
+            block_data = _new_block_data(
+                page_num, len(blocks), (x0, y0, x1, y1), page_width, page_height
+            )
+            block_data["text"] = text.strip()
+            blocks.append(block_data)
+        return blocks
+
+    # Get text as dictionary with full details
+    text_dict = page.get_text("dict", flags=fitz.TEXT_PRESERVE_WHITESPACE)
+
+    for block in text_dict.get("blocks", []):
+        # Skip image blocks
+        if block.get("type") != 0:
+            continue
+
+        block_data = _new_block_data(
+            page_num, len(blocks), block["bbox"], page_width, page_height
+        )
+        line_texts: list[str] = []
+
+        for line in block.get("lines", []):
+            line_data = {
+                "bbox": {
+                    "x0": line["bbox"][0],
+                    "y0": line["bbox"][1],
+                    "x1": line["bbox"][2],
+                    "y1": line["bbox"][3],
+                },
+                "spans": [],
+            }
+            span_texts: list[str] = []
+
+            for span in line.get("spans", []):
+                span_text = span.get("text", "")
+                span_texts.append(span_text)
+                span_data = {
+                    "text": span_text,
+                    "font": span.get("font", ""),
+                    "size": span.get("size", 12),
+                    "color": span.get("color", 0),  # Integer color
+                    "flags": span.get("flags", 0),  # Bold, italic, etc.
+                    "bbox": {
+                        "x0": span["bbox"][0],
+                        "y0": span["bbox"][1],
+                        "x1": span["bbox"][2],
+                        "y1": span["bbox"][3],
+                    },
+                }
+                line_data["spans"].append(span_data)
+
+            block_data["lines"].append(line_data)
+            line_texts.append("".join(span_texts))
+
+        # Full text of block, accumulated while walking the spans
+        block_data["text"] = "\n".join(line_texts).strip()
+
+        blocks.append(block_data)
+
+    return blocks
+
+
 def get_text_blocks(
     input_path: Path,
     page_num: int,
+    spans: bool = True,
 ) -> dict:
     """
     Extract text blocks from a PDF page with their positions.
 
     Returns blocks with coordinates in PDF points (origin bottom-left).
     Each block contains lines, and each line contains spans with font info.
+    Pass spans=False when only block text and geometry are needed.
     """
     result = {
         "success": False,
@@ -107,97 +323,96 @@ def get_text_blocks(
     }
 
     try:
-        doc = fitz.open(input_path)
+        doc = _open_document(input_path)
 
         if page_num < 0 or page_num >= len(doc):
             result["error"] = f"Invalid page number: {page_num}"
-            doc.close()
+            _release_document(doc)
             return result
 
         page = doc[page_num]
-        page_height = page.rect.height
+        page_rect = page.rect
 
-        # Get text as dictionary with full details
-        text_dict = page.get_text("dict", flags=fitz.TEXT_PRESERVE_WHITESPACE)
+        result["success"] = True
+        result["blocks"] = _extract_blocks_from_page(page, page_num, spans)
+        result["page_width"] = page_rect.width
+        result["page_height"] = page_rect.height
+        _release_document(doc)
 
-        blocks = []
-        for block in text_dict.get("blocks", []):
-            # Skip image blocks
-            if block.get("type") != 0:
-                continue
+    except Exception as e:
+        result["error"] = str(e)
 
-            block_data = {
-                "id": f"block_{page_num}_{len(blocks)}",
-                "bbox": {
-                    "x0": block["bbox"][0],
-                    "y0": block["bbox"][1],
-                    "x1": block["bbox"][2],
-                    "y1": block["bbox"][3],
-                },
-                # Normalized coordinates (0-1) for frontend
-                "rect": {
-                    "x": block["bbox"][0] / page.rect.width,
-                    "y": block["bbox"][1] / page_height,
-                    "width": (block["bbox"][2] - block["bbox"][0]) / page.rect.width,
-                    "height": (block["bbox"][3] - block["bbox"][1]) / page_height,
-                },
-                "lines": [],
-            }
+    return result
 
-            for line in block.get("lines", []):
-                line_data = {
-                    "bbox": {
-                        "x0": line["bbox"][0],
-                        "y0": line["bbox"][1],
-                        "x1": line["bbox"][2],
-                        "y1": line["bbox"][3],
-                    },
-                    "spans": [],
-                }
 
-                for span in line.get("spans", []):
-                    span_data = {
-                        "text": span.get("text", ""),
-                        "font": span.get("font", ""),
-                        "size": span.get("size", 12),
-                        "color": span.get("color", 0),  # Integer color
-                        "flags": span.get("flags", 0),  # Bold, italic, etc.
-                        "bbox": {
-                            "x0": span["bbox"][0],
-                            "y0": span["bbox"][1],
-                            "x1": span["bbox"][2],
-                            "y1": span["bbox"][3],
-                        },
-                    }
-                    line_data["spans"].append(span_data)
+def _iter_page_blocks(
+    doc: fitz.Document,
+    page_nums: Iterable[int],
+    spans: bool = True,
+) -> Iterator[dict]:
+    """Yield the text block record of each requested page of an open document."""
+    for page_num in page_nums:
+        page = doc[page_num]
+        try:
+            blocks = _extract_blocks_from_page(page, page_num, spans)
+        except Exception:
+            continue  # Skip unreadable pages, as before
+        page_rect = page.rect
+        yield {
+            "page": page_num,
+            "blocks": blocks,
+            "width": page_rect.width,
+            "height": page_rect.height,
+        }
 
-                block_data["lines"].append(line_data)
 
-            # Get full text of block
-            block_text = ""
-            for line in block_data["lines"]:
-                for span in line["spans"]:
-                    block_text += span["text"]
-                block_text += "\n"
-            block_data["text"] = block_text.strip()
+def iter_all_text_blocks(input_path: Path, spans: bool = True) -> Iterator[dict]:
+    """
+    Yield text blocks page by page from a single open document.
 
-            blocks.append(block_data)
+    Streaming counterpart of get_all_text_blocks: peak memory is bounded
+    by one page's blocks, so callers can write each page out (e.g. as
+    newline-delimited JSON) as soon as it is extracted.
+    """
+    doc = _open_document(input_path)
+    try:
+        yield from _iter_page_blocks(doc, range(len(doc)), spans)
+    finally:
+        _release_document(doc)
 
-        result["success"] = True
-        result["blocks"] = blocks
-        result["page_width"] = page.rect.width
-        result["page_height"] = page_height
-        doc.close()
 
-    except Exception as e:
-        result["error"] = str(e)
+def _extract_pages(
+    input_path: Path,
+    page_nums: list[int],
+    spans: bool = True,
+) -> list[dict]:
+    """
+    Extract text blocks for a run of pages from one open document.
 
-    return result
+    Module-level so it can run in a worker process; each call opens its
+    own document since MuPDF handles cannot be shared across processes.
+    """
+    doc = fitz.open(input_path)
+    try:
+        return list(_iter_page_blocks(doc, page_nums, spans))
+    finally:
+        doc.close()
 
 
-def get_all_text_blocks(input_path: Path) -> dict:
+def get_all_text_blocks(
+    input_path: Path,
+    num_workers: int = 1,
+    spans: bool = True,
+) -> dict:
     """
     Extract text blocks from all pages.
+
+    spans=False skips per-span details, as in get_text_blocks.
+
+    Runs sequentially by default. With num_workers > 1 the pages are split
+    into contiguous chunks and extracted in a process pool; every worker
+    re-imports PyMuPDF and reopens the file, so only opt in for large
+    documents. Small documents (under 4 pages) always run sequentially.
     """
     result = {
         "success": False,
@@ -206,20 +421,27 @@ def get_all_text_blocks(input_path: Path) -> dict:
     }
 
     try:
-        doc = fitz.open(input_path)
+        doc = _open_document(input_path)
+        total_pages = len(doc)
+        _release_document(doc)
 
-        for page_num in range(len(doc)):
-            page_result = get_text_blocks(input_path, page_num)
-            if page_result["success"]:
-                result["pages"].append({
-                    "page": page_num,
-                    "blocks": page_result["blocks"],
-                    "width": page_result["page_width"],
-                    "height": page_result["page_height"],
-                })
+        page_nums = list(range(total_pages))
+        if num_workers <= 1 or total_pages < 4:
+            result["pages"] = list(iter_all_text_blocks(input_path, spans))
+        else:
+            workers = min(num_workers, total_pages)
+            chunk_size = -(-total_pages // workers)  # ceil division
+            chunks = [page_nums[i:i + chunk_size] for i in range(0, total_pages, chunk_size)]
+
+            pages = []
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = [pool.submit(_extract_pages, input_path, chunk, spans) for chunk in chunks]
+                for future in as_completed(futures):
+                    pages.extend(future.result())
+            pages.sort(key=lambda p: p["page"])
+            result["pages"] = pages
 
         result["success"] = True
-        doc.close()
 
     except Exception as e:
         result["error"] = str(e)
@@ -297,6 +519,8 @@ def replace_text_area(
     font_name: str = "helv",
     font_size: float = 12,
     color: tuple = (0, 0, 0),
+    *,
+    optimize: bool = False,
 ) -> dict:
     """
     Replace text in a rectangular area.
@@ -338,7 +562,7 @@ def replace_text_area(
             color=color,
         )
 
-        doc.save(output_path, garbage=4, deflate=True)
+        _save_document(doc, input_path, output_path, optimize=optimize)
         doc.close()
 
         result["success"] = True
@@ -395,14 +619,107 @@ def insert_image(
     return result
 
 
+_EDIT_OP_TYPES = frozenset(("insert_text", "replace_text", "draw_shape"))
+
+
+def _is_effective_op(op: dict) -> bool:
+    """Check whether an edit op can change the document at all."""
+    op_type = op.get("type")
+    if op_type not in _EDIT_OP_TYPES:
+        return False
+    if op.get("page", 0) < 0:
+        return False
+    if op_type == "insert_text" and not op.get("text"):
+        return False
+    return True
+
+
+def _save_options(optimize: bool) -> dict:
+    """
+    Keyword arguments for doc.save after an edit.
+
+    garbage=1 only drops the objects orphaned by redactions and inserts,
+    which is all an edit leaves behind and keeps saves fast on large files.
+    optimize=True runs the full compaction (dedupe objects, clean content
+    streams) for a smaller file at a much higher save cost.
+    """
+    if optimize:
+        return {"garbage": 4, "deflate": True, "clean": True}
+    return {"garbage": 1, "deflate": True}
+
+
+def _save_document(
+    doc: fitz.Document,
+    input_path: Path,
+    output_path: Path,
+    *,
+    optimize: bool = False,
+    incremental: bool = False,
+    fast: bool = False,
+) -> None:
+    """
+    Save an edited document with the cheapest write that fits the request.
+
+    Saving over the input appends only the changed objects (incremental
+    save). incremental=True also skips garbage collection when writing a
+    new file, for callers that know their edits are small. fast=True skips
+    garbage collection, cleaning and compression altogether: for previews
+    and dry runs the file is larger but renders identically.
+
+    An output path of "-" writes the PDF bytes to stdout, so a caller that
+    reads the result straight back can skip the file round-trip.
+    """
+    if is_same_file(input_path, output_path):
+        doc.save(doc.name, incremental=True, encryption=fitz.PDF_ENCRYPT_KEEP)
+        return
+
+    if fast:
+        save_kwargs = {"garbage": 0, "clean": False, "deflate": False}
+    elif incremental:
+        save_kwargs = {"garbage": 0, "deflate": True}
+    else:
+        save_kwargs = _save_options(optimize)
+
+    if _is_stdout(output_path):
+        sys.stdout.buffer.write(doc.tobytes(**save_kwargs))
+        sys.stdout.buffer.flush()
+    else:
+        doc.save(output_path, **save_kwargs)
+
+
+def _is_stdout(output_path: Path) -> bool:
+    """True if the output path is "-", meaning the PDF goes to stdout."""
+    return os.fspath(output_path) == "-"
+
+
+def _copy_unchanged(input_path: Path, output_path: Path) -> None:
+    """Write the input unchanged to the output, unless they are the same file."""
+    if _is_stdout(output_path):
+        with open(input_path, "rb") as f:
+            shutil.copyfileobj(f, sys.stdout.buffer)
+        sys.stdout.buffer.flush()
+    elif not is_same_file(input_path, output_path):
+        shutil.copyfile(input_path, output_path)
+
+
 def apply_edits(
     input_path: Path,
     output_path: Path,
     edits_json: str,
+    *,
+    optimize: bool = False,
+    incremental: bool = False,
+    fast: bool = False,
 ) -> dict:
     """
     Apply multiple edit operations to a PDF.
 
+    optimize=True saves with full garbage collection and content cleaning
+    for a smaller output; the default only drops orphaned objects.
+    incremental=True skips garbage collection entirely; saving over the
+    input is always incremental. fast=True also skips compression, for
+    transient output such as previews (larger file, same content).
+
     edits_json format:
     {
         "ops": [
@@ -429,7 +746,7 @@ def apply_edits(
     }
 
     try:
-        edits = json.loads(edits_json)
+        edits = _json_loads(edits_json)
         ops = edits.get("ops", [])
         page_widths = edits.get("pageWidths", {})
         page_heights = edits.get("pageHeights", {})
@@ -445,16 +762,32 @@ def apply_edits(
             result["message"] = "No operations to apply"
             return result
 
+        # Drop ops that cannot change the document before paying for fitz.open
+        ops = [op for op in ops if _is_effective_op(op)]
+        if not ops:
+            _copy_unchanged(input_path, output_path)
+            result["success"] = True
+            result["message"] = "No effective operations"
+            return result
+
         doc = fitz.open(input_path)
         applied_count = 0
 
-        # Two-pass approach for replace_text operations:
-        # Pass 1: Collect all redactions and text insertions by page
-        # Pass 2: Apply all redactions once per page, then insert all text
-        # This prevents apply_redactions() from being called multiple times which corrupts the page
+        # Bind hot constructors locally; the op loops call them per op/line
+        Rect = fitz.Rect
+        Point = fitz.Point
 
-        # Collect replace_text operations by page for batched processing
+        # Two-pass approach:
+        # Pass 1: Collect redactions, text insertions and shapes by page
+        # Pass 2: Per page, apply all redactions once, then draw all shapes
+        #         with a single commit and insert all text back-to-back
+        # This prevents apply_redactions() from being called multiple times which corrupts the page,
+        # and keeps redactions from erasing text/shapes added by other ops
+
+        # Collect operations by page for batched processing
         replace_ops_by_page: dict = {}  # page_num -> list of op data
+        inserts_by_page: dict = {}  # page_num -> list of (point, text, insert_text kwargs)
+        shapes_by_page: dict = {}  # page_num -> list of (shape_type, rect, finish kwargs)
 
         for op in ops:
             op_type = op.get("type")
@@ -464,8 +797,9 @@ def apply_edits(
                 continue
 
             page = doc[page_num]
-            page_width = float(page_widths.get(str(page_num), page.rect.width))
-            page_height = float(page_heights.get(str(page_num), page.rect.height))
+            page_rect = page.rect
+            page_width = float(page_widths.get(str(page_num), page_rect.width))
+            page_height = float(page_heights.get(str(page_num), page_rect.height))
 
             # Convert normalized rect to PDF points
             rect = op.get("rect", {})
@@ -487,16 +821,17 @@ def apply_edits(
                 color = parse_hex_color(color_str)
                 font_name, font_file = get_font_for_insert(css_font)
 
-                point = fitz.Point(x0, y0 + font_size)
-                page.insert_text(
-                    point,
+                inserts_by_page.setdefault(page_num, []).append((
+                    Point(x0, y0 + font_size),
                     text,
-                    fontname=font_name,
-                    fontfile=font_file,
-                    fontsize=font_size,
-                    color=color,
-                    rotate=int(rotation) if rotation else 0,
-                )
+                    {
+                        "fontname": font_name,
+                        "fontfile": font_file,
+                        "fontsize": font_size,
+                        "color": color,
+                        "rotate": int(rotation) if rotation else 0,
+                    },
+                ))
                 applied_count += 1
 
             elif op_type == "replace_text":
@@ -531,13 +866,13 @@ def apply_edits(
                     safe_y1 = orig_y0 + orig_h - bottom_shrink
 
                     # Use the SAME shrunk rect for both cover and redaction
-                    cover_rect = fitz.Rect(orig_x0, safe_y0, orig_x0 + orig_w, safe_y1)
+                    cover_rect = Rect(orig_x0, safe_y0, orig_x0 + orig_w, safe_y1)
                     redact_rect = cover_rect  # Same conservative rect for both
                     print(f"[DEBUG] Single-line: orig_h={orig_h:.1f}, shrunk from y={orig_y0:.1f}-{orig_y0+orig_h:.1f} to {safe_y0:.1f}-{safe_y1:.1f}", file=sys.stderr)
                 else:
                     # Fallback: use op rect directly (no downward extension).
                     # Downward extensions can overlap the next line in OCR PDFs.
-                    cover_rect = fitz.Rect(x0, y0, x1, y1)
+                    cover_rect = Rect(x0, y0, x1, y1)
                     redact_rect = cover_rect
 
                 # Store for batched processing
@@ -569,45 +904,58 @@ def apply_edits(
                 stroke_color = parse_hex_color(stroke_color_str)
                 fill_color = parse_hex_color(fill_color_str) if fill_color_str else None
 
-                shape = page.new_shape()
-                draw_rect = fitz.Rect(x0, y0, x1, y1)
-
-                if shape_type == "rect":
-                    shape.draw_rect(draw_rect)
-                elif shape_type == "ellipse":
-                    shape.draw_oval(draw_rect)
-                elif shape_type == "line":
-                    shape.draw_line(fitz.Point(x0, y1), fitz.Point(x1, y0))
-
-                shape.finish(
-                    color=stroke_color,
-                    fill=fill_color,
-                    width=stroke_width,
-                )
-                shape.commit()
+                shapes_by_page.setdefault(page_num, []).append((
+                    shape_type,
+                    Rect(x0, y0, x1, y1),
+                    {"color": stroke_color, "fill": fill_color, "width": stroke_width},
+                ))
                 applied_count += 1
 
-        # PASS 2: Process all replace_text operations by page (batched)
+        # PASS 2: Process all operations by page (batched)
         # This ensures apply_redactions() is only called once per page
-        for page_num, ops_list in replace_ops_by_page.items():
+        pages_to_edit = {**replace_ops_by_page, **shapes_by_page, **inserts_by_page}.keys()
+        for page_num in sorted(pages_to_edit):
             page = doc[page_num]
-
-            # Step 1: Draw all white rectangles first (for OCR'd PDFs)
-            # Use cover_rect (full size) to completely cover original scanned text
-            for op_data in ops_list:
+            ops_list = replace_ops_by_page.get(page_num, [])
+            add_redact_annot = page.add_redact_annot
+            page_insert_text = page.insert_text
+
+            if ops_list:
+                # Step 1: Draw all white rectangles first (for OCR'd PDFs)
+                # Use cover_rect (full size) to completely cover original scanned text.
+                # Same style for all, so they form one path and one commit.
                 shape = page.new_shape()
-                shape.draw_rect(op_data["cover_rect"])
+                for op_data in ops_list:
+                    shape.draw_rect(op_data["cover_rect"])
                 shape.finish(fill=(1, 1, 1), color=(1, 1, 1), width=0)
                 shape.commit()
 
-            # Step 2: Add all redaction annotations
-            for op_data in ops_list:
-                page.add_redact_annot(op_data["redact_rect"], fill=(1, 1, 1))
+                # Step 2: Add all redaction annotations
+                for op_data in ops_list:
+                    add_redact_annot(op_data["redact_rect"], fill=(1, 1, 1))
 
-            # Step 3: Apply all redactions ONCE
-            page.apply_redactions()
+                # Step 3: Apply all redactions ONCE
+                page.apply_redactions()
+
+            # Step 4: Draw all user shapes into one Shape, committed once
+            page_shapes = shapes_by_page.get(page_num)
+            if page_shapes:
+                shape = page.new_shape()
+                for shape_type, draw_rect, finish_kwargs in page_shapes:
+                    if shape_type == "rect":
+                        shape.draw_rect(draw_rect)
+                    elif shape_type == "ellipse":
+                        shape.draw_oval(draw_rect)
+                    elif shape_type == "line":
+                        shape.draw_line(draw_rect.bl, draw_rect.tr)
+                    shape.finish(**finish_kwargs)
+                shape.commit()
+
+            # Step 5: Insert all new text back-to-back
+            for point, text, insert_kwargs in inserts_by_page.get(page_num, []):
+                page_insert_text(point, text, **insert_kwargs)
 
-            # Step 4: Insert all new text
+            # Step 6: Insert all replacement text
             for op_data in ops_list:
                 text = op_data["text"]
                 new_lines = op_data["new_lines"]
@@ -638,8 +986,8 @@ def apply_edits(
                         text_y = line_y0 + (line_height * 0.82)
 
                         try:
-                            page.insert_text(
-                                fitz.Point(line_x0, text_y),
+                            page_insert_text(
+                                Point(line_x0, text_y),
                                 new_text,
                                 fontname=font_name,
                                 fontfile=font_file,
@@ -664,8 +1012,8 @@ def apply_edits(
 
                     for line in new_lines:
                         try:
-                            page.insert_text(
-                                fitz.Point(x0, current_y),
+                            page_insert_text(
+                                Point(x0, current_y),
                                 line,
                                 fontname=font_name,
                                 fontfile=font_file,
@@ -679,7 +1027,14 @@ def apply_edits(
 
                 applied_count += 1
 
-        doc.save(output_path, garbage=4, deflate=True)
+        if pages_to_edit:
+            _save_document(
+                doc, input_path, output_path,
+                optimize=optimize, incremental=incremental, fast=fast,
+            )
+        else:
+            # Every op pointed past the last page; nothing to garbage-collect
+            _copy_unchanged(input_path, output_path)
         doc.close()
 
         result["success"] = True
@@ -692,6 +1047,47 @@ def apply_edits(
     return result
 
 
+# Map specific CSS font names (lowercase) to PyMuPDF built-in fonts
+_FONT_MAP = {
+    # Serif fonts
+    "times new roman": "tiro",
+    "times": "tiro",
+    "georgia": "tiro",
+    "palatino": "tiro",
+    "palatino linotype": "tiro",
+    "book antiqua": "tiro",
+    "garamond": "tiro",
+    "cambria": "tiro",
+    "dejavu serif": "tiro",
+    "liberation serif": "tiro",
+    "noto serif": "tiro",
+    "freeserif": "tiro",
+
+    # Sans-serif fonts
+    "arial": "helv",
+    "helvetica": "helv",
+    "verdana": "helv",
+    "tahoma": "helv",
+    "trebuchet ms": "helv",
+    "calibri": "helv",
+    "dejavu sans": "helv",
+    "liberation sans": "helv",
+    "noto sans": "helv",
+    "freesans": "helv",
+
+    # Monospace fonts (only match if explicitly named)
+    "courier": "cour",
+    "courier new": "cour",
+    "consolas": "cour",
+    "monaco": "cour",
+    "dejavu sans mono": "cour",
+    "liberation mono": "cour",
+    "noto mono": "cour",
+    "freemono": "cour",
+}
+
+
+@lru_cache(maxsize=256)
 def parse_hex_color(hex_str: str) -> tuple:
     """Parse hex color string to RGB tuple (0-1 range)."""
     if not hex_str:
@@ -705,6 +1101,7 @@ def parse_hex_color(hex_str: str) -> tuple:
     return (0, 0, 0)
 
 
+@lru_cache(maxsize=512)
 def parse_css_font_family(css_font: str) -> str:
     """
     Parse CSS font-family string and return PyMuPDF font name.
@@ -714,6 +1111,8 @@ def parse_css_font_family(css_font: str) -> str:
 
     PRIORITY: Font name detection > serif category > monospace category
     (Reduces false monospace detection from OCR documents)
+
+    Cached: edit ops in a document share a handful of font stacks.
     """
     if not css_font:
         return "tiro"  # Default to serif for documents
@@ -724,50 +1123,11 @@ def parse_css_font_family(css_font: str) -> str:
     # Check the last token for font category (serif, sans-serif, monospace)
     category = fonts[-1].lower() if fonts else ""
 
-    # Map specific fonts to PyMuPDF names
-    font_map = {
-        # Serif fonts
-        "times new roman": "tiro",
-        "times": "tiro",
-        "georgia": "tiro",
-        "palatino": "tiro",
-        "palatino linotype": "tiro",
-        "book antiqua": "tiro",
-        "garamond": "tiro",
-        "cambria": "tiro",
-        "dejavu serif": "tiro",
-        "liberation serif": "tiro",
-        "noto serif": "tiro",
-        "freeserif": "tiro",
-
-        # Sans-serif fonts
-        "arial": "helv",
-        "helvetica": "helv",
-        "verdana": "helv",
-        "tahoma": "helv",
-        "trebuchet ms": "helv",
-        "calibri": "helv",
-        "dejavu sans": "helv",
-        "liberation sans": "helv",
-        "noto sans": "helv",
-        "freesans": "helv",
-
-        # Monospace fonts (only match if explicitly named)
-        "courier": "cour",
-        "courier new": "cour",
-        "consolas": "cour",
-        "monaco": "cour",
-        "dejavu sans mono": "cour",
-        "liberation mono": "cour",
-        "noto mono": "cour",
-        "freemono": "cour",
-    }
-
     # Try to match specific fonts first
     for font in fonts:
         font_lower = font.lower()
-        if font_lower in font_map:
-            return font_map[font_lower]
+        if font_lower in _FONT_MAP:
+            return _FONT_MAP[font_lower]
 
     # Fall back to category - prioritize serif over monospace
     if category == "serif":
@@ -790,29 +1150,224 @@ def int_color_to_hex(color_int: int) -> str:
     return f"#{r:02x}{g:02x}{b:02x}"
 
 
+def _group_ops_by_page(ops: list[dict]) -> dict[int, list[dict]]:
+    """Group edit ops by their target page, preserving op order."""
+    ops_by_page: dict[int, list[dict]] = {}
+    for op in ops:
+        ops_by_page.setdefault(op.get("page", 0), []).append(op)
+    return ops_by_page
+
+
+@lru_cache(maxsize=16)
+def _index_ops_by_page(edits_json: str) -> dict[int, list[dict]]:
+    """
+    Parse an edits JSON string and group its ops by page.
+
+    Cached on the raw string: live preview re-renders the same page with
+    the same edits repeatedly. Callers must not mutate the result.
+    """
+    edits = _json_loads(edits_json) if edits_json else {"ops": []}
+    return _group_ops_by_page(edits.get("ops", []))
+
+
+def _apply_ops_to_page(
+    page: fitz.Page,
+    ops: list[dict],
+    page_width: float,
+    page_height: float,
+) -> None:
+    """
+    Apply preview edit ops (already filtered to this page) to a page.
+    """
+    # replace_text redactions are applied once after all ops are seen, and
+    # everything drawn is queued until then so the redactions cannot erase
+    # it. Drawing order matches apply_edits: shapes, inserted text, then
+    # the replacement lines.
+    pending_shapes: list[tuple] = []
+    pending_texts: list[tuple] = []
+    pending_inserts: list[tuple] = []
+    has_redactions = False
+
+    # Bind hot constructors and page methods locally for the op loop
+    Rect = fitz.Rect
+    Point = fitz.Point
+    page_insert_text = page.insert_text
+    add_redact_annot = page.add_redact_annot
+
+    for op in ops:
+        op_type = op.get("type")
+        rect = op.get("rect", {})
+
+        # Convert normalized rect to PDF points
+        x0 = rect.get("x", 0) * page_width
+        y0 = rect.get("y", 0) * page_height
+        w = rect.get("width", 0) * page_width
+        h = rect.get("height", 0) * page_height
+        x1 = x0 + w
+        y1 = y0 + h
+
+        if op_type == "insert_text":
+            text = op.get("text", "")
+            if not text:
+                continue
+            style = op.get("style", {})
+            css_font = style.get("fontFamily", "helv")
+            font_size = style.get("fontSize", 12)
+            color_str = style.get("color", "#000000")
+            rotation = style.get("rotation", 0)
+            color = parse_hex_color(color_str)
+
+            # Get font name and optional font file for system fonts
+            font_name, font_file = get_font_for_insert(css_font)
+
+            pending_texts.append((
+                Point(x0, y0 + font_size),
+                text,
+                font_name,
+                font_file,
+                font_size,
+                color,
+                int(rotation) if rotation else 0,
+            ))
+
+        elif op_type == "replace_text":
+            text = op.get("text", "")
+            style = op.get("style", {})
+            css_font = style.get("fontFamily", "helv")
+            font_size = style.get("fontSize", 12)
+            color_str = style.get("color", "#000000")
+            rotation = style.get("rotation", 0)
+            color = parse_hex_color(color_str)
+
+            # Get font name and optional font file for system fonts
+            font_name, font_file = get_font_for_insert(css_font)
+
+            # Calculate font size from bounding box (same logic as apply_edits)
+            original_font_size = font_size
+            rect_height = y1 - y0
+            lines = [l for l in text.split('\n') if l.strip()] if text else []
+            num_lines = max(1, len(lines))
+            calculated_font_size = rect_height / (num_lines * 1.2)
+
+            # Detect OCR font and use calculated size
+            is_ocr_font = 'glyphless' in css_font.lower() or 'ocr' in css_font.lower()
+            if is_ocr_font:
+                font_size = calculated_font_size
+            else:
+                scaled_font_size = original_font_size * 1.08
+                font_size = max(scaled_font_size, calculated_font_size * 0.95)
+
+            # Extend redaction rect for descenders (letters like p, g, j, q)
+            descender_extension = font_size * 0.3
+            redact_rect = Rect(x0, y0, x1, y1 + descender_extension)
+            add_redact_annot(redact_rect, fill=(1, 1, 1))
+            has_redactions = True
+
+            # Queue insert_text for each line until redactions are applied
+            if text:
+                line_height = font_size * 1.2
+                current_y = y0 + font_size
+
+                for line in lines:
+                    pending_inserts.append((
+                        Point(x0, current_y),
+                        line,
+                        font_name,
+                        font_file,
+                        font_size,
+                        color,
+                        int(rotation) if rotation else 0,
+                    ))
+                    current_y += line_height
+
+        elif op_type == "draw_shape":
+            shape_type = op.get("shape", "rect")
+            stroke_color_str = op.get("strokeColor", "#000000")
+            stroke_width = op.get("strokeWidth", 1)
+            fill_color_str = op.get("fillColor")
+
+            stroke_color = parse_hex_color(stroke_color_str)
+            fill_color = parse_hex_color(fill_color_str) if fill_color_str else None
+
+            pending_shapes.append((
+                shape_type,
+                Rect(x0, y0, x1, y1),
+                {"color": stroke_color, "fill": fill_color, "width": stroke_width},
+            ))
+
+    # Apply all replace_text redactions ONCE, then draw on top of them
+    if has_redactions:
+        page.apply_redactions()
+
+    if pending_shapes:
+        shape = page.new_shape()
+        for shape_type, draw_rect, finish_kwargs in pending_shapes:
+            if shape_type == "rect":
+                shape.draw_rect(draw_rect)
+            elif shape_type == "ellipse":
+                shape.draw_oval(draw_rect)
+            elif shape_type == "line":
+                shape.draw_line(draw_rect.bl, draw_rect.tr)
+            shape.finish(**finish_kwargs)
+        shape.commit()
+
+    for point, line, font_name, font_file, font_size, color, rotate in pending_texts + pending_inserts:
+        page_insert_text(
+            point,
+            line,
+            fontname=font_name,
+            fontfile=font_file,
+            fontsize=font_size,
+            color=color,
+            rotate=rotate,
+        )
+
+
 def render_page_preview(
     input_path: Path,
     page_num: int,
     edits_json: str,
     dpi: int = 150,
+    *,
+    edits: dict | None = None,
+    image_format: str = "png",
+    quality: int = 80,
+    raw: bool = False,
+    alpha: bool = False,
 ) -> dict:
     """
     Render a page with edits applied as a PNG image (base64).
 
     This provides live preview without saving the file.
-    Returns base64-encoded PNG data.
+    Returns base64-encoded PNG data, or JPEG when image_format is "jpg"
+    (much cheaper to encode than PNG's deflate; quality sets the JPEG
+    quality). The encoding used is reported in result["format"].
+
+    With raw=True (in-process callers, or the CLI's --raw binary framing)
+    the encoded bytes are returned in result["image_bytes"] and the
+    base64 pass is skipped; result["image"] is left empty.
+
+    Pages render to 3-channel RGB; alpha=True adds a transparency channel
+    for PNG output (JPEG has none, so it is ignored there).
+
+    In-process callers that already hold the parsed edits can pass them
+    as ``edits`` to skip decoding ``edits_json``.
     """
     result = {
         "success": False,
-        "image": "",  # base64 PNG
+        "image": "",  # base64 PNG or JPEG
+        "format": "png",
         "width": 0,
         "height": 0,
         "error": None,
     }
 
     try:
-        edits = json.loads(edits_json) if edits_json else {"ops": []}
-        ops = edits.get("ops", [])
+        if edits is not None:
+            ops_by_page = _group_ops_by_page(edits.get("ops", []))
+        else:
+            ops_by_page = _index_ops_by_page(edits_json)
+        page_ops = ops_by_page.get(page_num, [])
 
         doc = fitz.open(input_path)
 
@@ -822,162 +1377,179 @@ def render_page_preview(
             return result
 
         page = doc[page_num]
-        page_width = page.rect.width
-        page_height = page.rect.height
+        _apply_ops_to_page(page, page_ops, page.rect.width, page.rect.height)
 
-        # Apply edits to this page
-        for op in ops:
-            op_page = op.get("page", 0)
-            if op_page != page_num:
-                continue
+        is_jpeg = image_format.lower() in ("jpg", "jpeg")
 
-            op_type = op.get("type")
-            rect = op.get("rect", {})
+        # Render page to an RGB pixmap (never the document's native
+        # colorspace, e.g. CMYK, and no alpha unless asked for)
+        zoom = dpi / 72.0
+        mat = fitz.Matrix(zoom, zoom)
+        pix = page.get_pixmap(
+            matrix=mat,
+            colorspace=fitz.csRGB,
+            alpha=alpha and not is_jpeg,
+        )
 
-            # Convert normalized rect to PDF points
-            x0 = rect.get("x", 0) * page_width
-            y0 = rect.get("y", 0) * page_height
-            w = rect.get("width", 0) * page_width
-            h = rect.get("height", 0) * page_height
-            x1 = x0 + w
-            y1 = y0 + h
+        # Convert to image bytes
+        if is_jpeg:
+            image_bytes = pix.tobytes("jpg", jpg_quality=quality)
+            result["format"] = "jpg"
+        else:
+            image_bytes = pix.tobytes("png")
 
-            if op_type == "insert_text":
-                text = op.get("text", "")
-                if not text:
-                    continue
-                style = op.get("style", {})
-                css_font = style.get("fontFamily", "helv")
-                font_size = style.get("fontSize", 12)
-                color_str = style.get("color", "#000000")
-                rotation = style.get("rotation", 0)
-                color = parse_hex_color(color_str)
+        if raw:
+            result["image_bytes"] = image_bytes
+        else:
+            result["image"] = base64.b64encode(image_bytes).decode("ascii")
 
-                # Get font name and optional font file for system fonts
-                font_name, font_file = get_font_for_insert(css_font)
+        result["success"] = True
+        result["width"] = pix.width
+        result["height"] = pix.height
 
-                point = fitz.Point(x0, y0 + font_size)
-                page.insert_text(
-                    point,
-                    text,
-                    fontname=font_name,
-                    fontfile=font_file,
-                    fontsize=font_size,
-                    color=color,
-                    rotate=int(rotation) if rotation else 0,
-                )
+        doc.close()
 
-            elif op_type == "replace_text":
-                text = op.get("text", "")
-                style = op.get("style", {})
-                css_font = style.get("fontFamily", "helv")
-                font_size = style.get("fontSize", 12)
-                color_str = style.get("color", "#000000")
-                rotation = style.get("rotation", 0)
-                color = parse_hex_color(color_str)
+    except Exception as e:
+        result["error"] = str(e)
 
-                # Get font name and optional font file for system fonts
-                font_name, font_file = get_font_for_insert(css_font)
+    return result
 
-                # Calculate font size from bounding box (same logic as apply_edits)
-                original_font_size = font_size
-                rect_height = y1 - y0
-                lines = [l for l in text.split('\n') if l.strip()] if text else []
-                num_lines = max(1, len(lines))
-                calculated_font_size = rect_height / (num_lines * 1.2)
-
-                # Detect OCR font and use calculated size
-                is_ocr_font = 'glyphless' in css_font.lower() or 'ocr' in css_font.lower()
-                if is_ocr_font:
-                    font_size = calculated_font_size
-                else:
-                    scaled_font_size = original_font_size * 1.08
-                    font_size = max(scaled_font_size, calculated_font_size * 0.95)
 
-                # Extend redaction rect for descenders (letters like p, g, j, q)
-                descender_extension = font_size * 0.3
-                redact_rect = fitz.Rect(x0, y0, x1, y1 + descender_extension)
-                page.add_redact_annot(redact_rect, fill=(1, 1, 1))
-                page.apply_redactions()
+@dataclass(slots=True)
+class SpanRecord:
+    """
+    One text span from get_text_blocks_with_fonts.
 
-                # Use insert_text for each line
-                if text:
-                    line_height = font_size * 1.2
-                    current_y = y0 + font_size
-
-                    for line in lines:
-                        point = fitz.Point(x0, current_y)
-                        page.insert_text(
-                            point,
-                            line,
-                            fontname=font_name,
-                            fontfile=font_file,
-                            fontsize=font_size,
-                            color=color,
-                            rotate=int(rotation) if rotation else 0,
-                        )
-                        current_y += line_height
+    Slotted instead of a dict: text-dense pages produce thousands of
+    spans. Serializes to the same JSON object as the former span dict
+    via to_dict() / _json_default.
+    """
 
-            elif op_type == "draw_shape":
-                shape_type = op.get("shape", "rect")
-                stroke_color_str = op.get("strokeColor", "#000000")
-                stroke_width = op.get("strokeWidth", 1)
-                fill_color_str = op.get("fillColor")
+    text: str
+    font: str
+    size: float
+    color: str
+    bold: bool
+    italic: bool
+    serif: bool
+    mono: bool
+    rect: dict
 
-                stroke_color = parse_hex_color(stroke_color_str)
-                fill_color = parse_hex_color(fill_color_str) if fill_color_str else None
+    def to_dict(self) -> dict:
+        return {name: getattr(self, name) for name in self.__slots__}
 
-                shape = page.new_shape()
-                draw_rect = fitz.Rect(x0, y0, x1, y1)
 
-                if shape_type == "rect":
-                    shape.draw_rect(draw_rect)
-                elif shape_type == "ellipse":
-                    shape.draw_oval(draw_rect)
-                elif shape_type == "line":
-                    shape.draw_line(fitz.Point(x0, y1), fitz.Point(x1, y0))
+def _json_default(obj):
+    """json.dumps hook for the slotted result records."""
+    if isinstance(obj, SpanRecord):
+        return obj.to_dict()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
 
-                shape.finish(
-                    color=stroke_color,
-                    fill=fill_color,
-                    width=stroke_width,
-                )
-                shape.commit()
 
-        # Render page to pixmap
-        zoom = dpi / 72.0
-        mat = fitz.Matrix(zoom, zoom)
-        pix = page.get_pixmap(matrix=mat)
+def _json_loads(data: str | bytes):
+    """Parse JSON with orjson when installed, else the stdlib."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
 
-        # Convert to PNG bytes
-        png_bytes = pix.tobytes("png")
 
-        # Encode as base64
-        b64_data = base64.b64encode(png_bytes).decode("utf-8")
+def _json_dumps(obj) -> str:
+    """Serialize results (including SpanRecord) with orjson when installed."""
+    if orjson is not None:
+        return orjson.dumps(obj, default=_json_default).decode("utf-8")
+    return json.dumps(obj, default=_json_default)
 
-        result["success"] = True
-        result["image"] = b64_data
-        result["width"] = pix.width
-        result["height"] = pix.height
 
-        doc.close()
+def _normalize_bbox(bbox, scale_x: float, scale_y: float) -> dict:
+    """
+    Convert an (x0, y0, x1, y1) bbox in points to a normalized (0-1) rect.
+
+    scale_x/scale_y are 1/page_width and 1/page_height, computed once per
+    page so each of the thousands of spans costs four multiplications.
+    """
+    x0, y0, x1, y1 = bbox
+    return {
+        "x": x0 * scale_x,
+        "y": y0 * scale_y,
+        "width": (x1 - x0) * scale_x,
+        "height": (y1 - y0) * scale_y,
+    }
 
-    except Exception as e:
-        result["error"] = str(e)
 
+def _text_blocks_cache_file(
+    input_path: Path,
+    page_num: int,
+    cache_dir: Path | None,
+) -> Path | None:
+    """Cache file for a page's font-aware text blocks, or None if unavailable."""
+    try:
+        key = file_cache_key(input_path, page_num, f"v{_TEXT_BLOCKS_CACHE_VERSION}")
+        directory = Path(cache_dir) if cache_dir else get_cache_dir("text_blocks")
+        directory.mkdir(parents=True, exist_ok=True)
+    except OSError:
+        return None
+    return directory / f"{key}.json"
+
+
+def _read_text_blocks_cache(cache_file: Path) -> dict | None:
+    """Load a cached get_text_blocks_with_fonts result, or None on a miss."""
+    try:
+        result = _json_loads(cache_file.read_bytes())
+        for block in result.get("blocks", []):
+            for line in block.get("lines", []):
+                line["spans"] = [SpanRecord(**span) for span in line.get("spans", [])]
+    except (OSError, ValueError, TypeError, KeyError, AttributeError):
+        # Unreadable, or written with a different span layout: a miss
+        return None
     return result
 
 
+def _write_text_blocks_cache(cache_file: Path, result: dict) -> None:
+    """Store a result atomically, then keep the cache directory bounded."""
+    try:
+        write_cache_file(cache_file, _json_dumps(result))
+    except OSError:
+        return  # Caching is best effort
+    prune_cache_dir(cache_file.parent, _TEXT_BLOCKS_CACHE_MAX_BYTES)
+
+
 def get_text_blocks_with_fonts(
     input_path: Path,
     page_num: int,
+    *,
+    use_cache: bool = True,
+    cache_dir: Path | None = None,
 ) -> dict:
     """
     Extract text blocks with detailed font information.
 
     Returns blocks with font name, size, color for each span.
     This uses PyMuPDF's dict extraction which has full font details.
+    Spans are SpanRecord objects; serialize with _json_dumps().
+
+    Successful results are cached on disk (default
+    ~/.cache/tlacuilo/text_blocks) keyed by path, mtime, size and page,
+    so reopening an unchanged PDF skips the extraction.
     """
+    cache_file = _text_blocks_cache_file(input_path, page_num, cache_dir) if use_cache else None
+    if cache_file is not None:
+        cached = _read_text_blocks_cache(cache_file)
+        if cached is not None:
+            return cached
+
+    result = _extract_text_blocks_with_fonts(input_path, page_num)
+
+    if cache_file is not None and result["success"]:
+        _write_text_blocks_cache(cache_file, result)
+
+    return result
+
+
+def _extract_text_blocks_with_fonts(
+    input_path: Path,
+    page_num: int,
+) -> dict:
+    """Uncached implementation of get_text_blocks_with_fonts."""
     result = {
         "success": False,
         "page": page_num,
@@ -986,17 +1558,29 @@ def get_text_blocks_with_fonts(
     }
 
     try:
-        doc = fitz.open(input_path)
+        doc = _open_document(input_path)
 
         if page_num < 0 or page_num >= len(doc):
             result["error"] = f"Invalid page number: {page_num}"
-            doc.close()
+            _release_document(doc)
             return result
 
         page = doc[page_num]
         page_width = page.rect.width
         page_height = page.rect.height
 
+        # Image-only or blank pages: skip the expensive dict extraction
+        if not _page_has_text(page):
+            result["success"] = True
+            result["pageWidth"] = page_width
+            result["pageHeight"] = page_height
+            _release_document(doc)
+            return result
+
+        # Normalize with multiplications by precomputed reciprocals
+        scale_x = 1.0 / page_width
+        scale_y = 1.0 / page_height
+
         # Get text with full details
         text_dict = page.get_text("dict", flags=fitz.TEXT_PRESERVE_WHITESPACE)
 
@@ -1011,12 +1595,7 @@ def get_text_blocks_with_fonts(
                 words_by_block_line[key] = []
             words_by_block_line[key].append({
                 "text": word_text,
-                "rect": {
-                    "x": x0 / page_width,
-                    "y": y0 / page_height,
-                    "width": (x1 - x0) / page_width,
-                    "height": (y1 - y0) / page_height,
-                },
+                "rect": _normalize_bbox((x0, y0, x1, y1), scale_x, scale_y),
                 "word_no": word_no,
             })
 
@@ -1026,12 +1605,7 @@ def get_text_blocks_with_fonts(
                 continue
 
             block_data = {
-                "rect": {
-                    "x": block["bbox"][0] / page_width,
-                    "y": block["bbox"][1] / page_height,
-                    "width": (block["bbox"][2] - block["bbox"][0]) / page_width,
-                    "height": (block["bbox"][3] - block["bbox"][1]) / page_height,
-                },
+                "rect": _normalize_bbox(block["bbox"], scale_x, scale_y),
                 "lines": [],
                 "dominantFont": None,
                 "dominantSize": None,
@@ -1039,15 +1613,17 @@ def get_text_blocks_with_fonts(
             }
 
             # Track font usage to find dominant style
-            font_counts = {}
-            size_counts = {}
-            color_counts = {}
+            font_counts: Counter = Counter()
+            size_counts: Counter = Counter()
+            color_counts: Counter = Counter()
 
             # Track serif/monospace flags
             serif_count = 0
             mono_count = 0
             total_char_count = 0
 
+            text_parts: list[str] = []
+
             for line_no, line in enumerate(block.get("lines", [])):
                 # Get line direction/rotation (dir is a tuple [cos, sin] of the angle)
                 line_dir = line.get("dir", (1.0, 0.0))  # Default horizontal
@@ -1061,16 +1637,12 @@ def get_text_blocks_with_fonts(
                 line_words = sorted(line_words, key=lambda w: w["word_no"])
 
                 line_data = {
-                    "rect": {
-                        "x": line["bbox"][0] / page_width,
-                        "y": line["bbox"][1] / page_height,
-                        "width": (line["bbox"][2] - line["bbox"][0]) / page_width,
-                        "height": (line["bbox"][3] - line["bbox"][1]) / page_height,
-                    },
+                    "rect": _normalize_bbox(line["bbox"], scale_x, scale_y),
                     "rotation": round(rotation_deg, 2),  # Text rotation angle
                     "spans": [],
                     "words": line_words,  # Word-level bboxes from OCR
                 }
+                span_texts: list[str] = []
 
                 for span in line.get("spans", []):
                     font = span.get("font", "")
@@ -1078,18 +1650,19 @@ def get_text_blocks_with_fonts(
                     color_int = span.get("color", 0)
                     flags = span.get("flags", 0)
                     text = span.get("text", "")
+                    span_texts.append(text)
 
                     # Count for dominant detection
                     text_len = len(text)
-                    font_counts[font] = font_counts.get(font, 0) + text_len
-                    size_counts[size] = size_counts.get(size, 0) + text_len
-                    color_counts[color_int] = color_counts.get(color_int, 0) + text_len
+                    font_counts[font] += text_len
+                    size_counts[size] += text_len
+                    color_counts[color_int] += text_len
 
-                    # Font type flags from PyMuPDF:
-                    # bit 0 = superscript, bit 1 = italic, bit 2 = serifed,
-                    # bit 3 = monospaced, bit 4 = bold
-                    is_serif = bool(flags & (1 << 2))  # bit 2
-                    is_mono = bool(flags & (1 << 3))   # bit 3
+                    # Decode font type flags once per span
+                    is_bold = bool(flags & _FLAG_BOLD)
+                    is_italic = bool(flags & _FLAG_ITALIC)
+                    is_serif = bool(flags & _FLAG_SERIF)
+                    is_mono = bool(flags & _FLAG_MONO)
 
                     if text.strip():
                         total_char_count += text_len
@@ -1098,25 +1671,21 @@ def get_text_blocks_with_fonts(
                         if is_mono:
                             mono_count += text_len
 
-                    span_data = {
-                        "text": text,
-                        "font": font,
-                        "size": round(size, 1),
-                        "color": int_color_to_hex(color_int),
-                        "bold": bool(flags & (1 << 4)),  # bit 4 = bold
-                        "italic": bool(flags & (1 << 1)),  # bit 1 = italic
-                        "serif": is_serif,  # bit 2 = serifed
-                        "mono": is_mono,    # bit 3 = monospaced
-                        "rect": {
-                            "x": span["bbox"][0] / page_width,
-                            "y": span["bbox"][1] / page_height,
-                            "width": (span["bbox"][2] - span["bbox"][0]) / page_width,
-                            "height": (span["bbox"][3] - span["bbox"][1]) / page_height,
-                        },
-                    }
+                    span_data = SpanRecord(
+                        text=text,
+                        font=font,
+                        size=round(size, 1),
+                        color=int_color_to_hex(color_int),
+                        bold=is_bold,
+                        italic=is_italic,
+                        serif=is_serif,
+                        mono=is_mono,
+                        rect=_normalize_bbox(span["bbox"], scale_x, scale_y),
+                    )
                     line_data["spans"].append(span_data)
 
                 block_data["lines"].append(line_data)
+                text_parts.append("".join(span_texts))
 
             # Determine dominant font type (serif/mono/sans)
             if total_char_count > 0:
@@ -1135,18 +1704,14 @@ def get_text_blocks_with_fonts(
 
             # Set dominant font info
             if font_counts:
-                block_data["dominantFont"] = max(font_counts, key=font_counts.get)
+                block_data["dominantFont"] = font_counts.most_common(1)[0][0]
             if size_counts:
-                block_data["dominantSize"] = max(size_counts, key=size_counts.get)
+                block_data["dominantSize"] = size_counts.most_common(1)[0][0]
             if color_counts:
-                dominant_color = max(color_counts, key=color_counts.get)
+                dominant_color = color_counts.most_common(1)[0][0]
                 block_data["dominantColor"] = int_color_to_hex(dominant_color)
 
-            # Get full text
-            text_parts = []
-            for line in block_data["lines"]:
-                line_text = "".join(s["text"] for s in line["spans"])
-                text_parts.append(line_text)
+            # Full text, accumulated while walking the spans
             block_data["text"] = "\n".join(text_parts)
 
             blocks.append(block_data)
@@ -1155,7 +1720,7 @@ def get_text_blocks_with_fonts(
         result["blocks"] = blocks
         result["pageWidth"] = page_width
         result["pageHeight"] = page_height
-        doc.close()
+        _release_document(doc)
 
     except Exception as e:
         result["error"] = str(e)
@@ -1163,6 +1728,75 @@ def get_text_blocks_with_fonts(
     return result
 
 
+def draw_shapes(
+    input_path: Path,
+    output_path: Path,
+    shapes: list[dict],
+    fast: bool = False,
+) -> dict:
+    """
+    Draw several shapes and save once.
+
+    Each shape is a dict with "page", "shape" ('rect', 'ellipse', 'line'),
+    "x0", "y0", "x1", "y1" and optional "stroke_color", "stroke_width" and
+    "fill_color". All shapes of a page go into one Shape object and one
+    content-stream commit. Shapes never need garbage collection, so the
+    output is written without it (incrementally when saving over the input).
+    fast=True also skips compression, for transient output.
+    """
+    result = {
+        "success": False,
+        "message": "",
+    }
+
+    try:
+        doc = fitz.open(input_path)
+        page_count = len(doc)
+
+        shapes_by_page: dict = {}
+        for spec in shapes:
+            page_num = spec.get("page", 0)
+            if page_num < 0 or page_num >= page_count:
+                result["message"] = f"Invalid page number: {page_num}"
+                doc.close()
+                return result
+            shape_type = spec.get("shape", "rect")
+            if shape_type not in ("rect", "ellipse", "line"):
+                result["message"] = f"Unknown shape type: {shape_type}"
+                doc.close()
+                return result
+            shapes_by_page.setdefault(page_num, []).append(spec)
+
+        for page_num, page_specs in shapes_by_page.items():
+            shape = doc[page_num].new_shape()
+            for spec in page_specs:
+                rect = fitz.Rect(spec["x0"], spec["y0"], spec["x1"], spec["y1"])
+                shape_type = spec.get("shape", "rect")
+                if shape_type == "rect":
+                    shape.draw_rect(rect)
+                elif shape_type == "ellipse":
+                    shape.draw_oval(rect)
+                else:
+                    shape.draw_line(rect.bl, rect.tr)
+                shape.finish(
+                    color=spec.get("stroke_color", (0, 0, 0)),
+                    fill=spec.get("fill_color"),
+                    width=spec.get("stroke_width", 1),
+                )
+            shape.commit()
+
+        _save_document(doc, input_path, output_path, incremental=True, fast=fast)
+        doc.close()
+
+        result["success"] = True
+        result["message"] = f"Drew {len(shapes)} shape(s)"
+
+    except Exception as e:
+        result["message"] = str(e)
+
+    return result
+
+
 def draw_shape(
     input_path: Path,
     output_path: Path,
@@ -1175,59 +1809,237 @@ def draw_shape(
     stroke_color: tuple = (0, 0, 0),
     stroke_width: float = 1,
     fill_color: Optional[tuple] = None,
+    fast: bool = False,
 ) -> dict:
     """
     Draw a shape on a page.
+
+    Single-shape form of draw_shapes.
     """
-    result = {
-        "success": False,
-        "message": "",
-    }
+    result = draw_shapes(input_path, output_path, [{
+        "page": page_num,
+        "shape": shape_type,
+        "x0": x0, "y0": y0, "x1": x1, "y1": y1,
+        "stroke_color": stroke_color,
+        "stroke_width": stroke_width,
+        "fill_color": fill_color,
+    }], fast=fast)
+    if result["success"]:
+        result["message"] = "Shape drawn"
+    return result
 
-    try:
-        doc = fitz.open(input_path)
 
-        if page_num < 0 or page_num >= len(doc):
-            result["message"] = f"Invalid page number: {page_num}"
-            doc.close()
-            return result
+# Known system fonts and their properties for matching (read-only)
+_SYSTEM_FONTS = MappingProxyType({
+    # Serif fonts
+    "times new roman": {"type": "serif", "weight": "normal", "style": "normal"},
+    "times": {"type": "serif", "weight": "normal", "style": "normal"},
+    "georgia": {"type": "serif", "weight": "normal", "style": "normal"},
+    "palatino": {"type": "serif", "weight": "normal", "style": "normal"},
+    "garamond": {"type": "serif", "weight": "normal", "style": "normal"},
+    "cambria": {"type": "serif", "weight": "normal", "style": "normal"},
+    "book antiqua": {"type": "serif", "weight": "normal", "style": "normal"},
+    "liberation serif": {"type": "serif", "weight": "normal", "style": "normal"},
+    "dejavu serif": {"type": "serif", "weight": "normal", "style": "normal"},
+    "noto serif": {"type": "serif", "weight": "normal", "style": "normal"},
+    "tiro": {"type": "serif", "weight": "normal", "style": "normal"},
+
+    # Sans-serif fonts
+    "arial": {"type": "sans", "weight": "normal", "style": "normal"},
+    "helvetica": {"type": "sans", "weight": "normal", "style": "normal"},
+    "verdana": {"type": "sans", "weight": "normal", "style": "normal"},
+    "tahoma": {"type": "sans", "weight": "normal", "style": "normal"},
+    "calibri": {"type": "sans", "weight": "normal", "style": "normal"},
+    "trebuchet ms": {"type": "sans", "weight": "normal", "style": "normal"},
+    "liberation sans": {"type": "sans", "weight": "normal", "style": "normal"},
+    "dejavu sans": {"type": "sans", "weight": "normal", "style": "normal"},
+    "noto sans": {"type": "sans", "weight": "normal", "style": "normal"},
+    "helv": {"type": "sans", "weight": "normal", "style": "normal"},
+
+    # Monospace fonts
+    "courier": {"type": "mono", "weight": "normal", "style": "normal"},
+    "courier new": {"type": "mono", "weight": "normal", "style": "normal"},
+    "consolas": {"type": "mono", "weight": "normal", "style": "normal"},
+    "monaco": {"type": "mono", "weight": "normal", "style": "normal"},
+    "liberation mono": {"type": "mono", "weight": "normal", "style": "normal"},
+    "dejavu sans mono": {"type": "mono", "weight": "normal", "style": "normal"},
+    "noto mono": {"type": "mono", "weight": "normal", "style": "normal"},
+    "cour": {"type": "mono", "weight": "normal", "style": "normal"},
+})
+
+
+# All font-name keywords in one case-insensitive pattern; each named group
+# sets one bit, so a single finditer pass classifies type, weight and style.
+# The lookahead keeps matches zero-width so overlapping keywords
+# ("TimesSans") are all seen. "sans" gets its own group since it also
+# vetoes a serif match.
+_FONT_ATTRS_RE = re.compile(
+    r"(?=(?P<mono>courier|mono|consol|fixed)"
+    r"|(?P<sansword>sans)"
+    r"|(?P<serif>times|roman|serif|georgia|palatino|garamond)"
+    r"|(?P<sans>arial|helv|verdana|calibri|gothic)"
+    r"|(?P<bold>bold|black|heavy|demi)"
+    r"|(?P<italic>italic|oblique|slant))",
+    re.IGNORECASE,
+)
+_ATTR_MONO = 1 << 0
+_ATTR_SERIF = 1 << 1
+_ATTR_SANS_WORD = 1 << 2
+_ATTR_SANS = 1 << 3
+_ATTR_BOLD = 1 << 4
+_ATTR_ITALIC = 1 << 5
+_ATTR_BITS = {
+    "mono": _ATTR_MONO,
+    "serif": _ATTR_SERIF,
+    "sansword": _ATTR_SANS_WORD | _ATTR_SANS,
+    "sans": _ATTR_SANS,
+    "bold": _ATTR_BOLD,
+    "italic": _ATTR_ITALIC,
+}
+
+
+def _classify_font_name(font_name: str, flags: int = 0) -> Tuple[str, bool, bool]:
+    """Determine (type, bold, italic) of a font from its name and flags."""
+    attrs = 0
+    for match in _FONT_ATTRS_RE.finditer(font_name):
+        attrs |= _ATTR_BITS[match.lastgroup]
+
+    # Name first, then flags
+    if attrs & _ATTR_MONO:
+        font_type = "mono"
+    elif attrs & _ATTR_SERIF and not attrs & _ATTR_SANS_WORD:
+        font_type = "serif"
+    elif attrs & _ATTR_SANS:
+        font_type = "sans"
+    elif flags & _FLAG_MONO:
+        font_type = "mono"
+    elif flags & _FLAG_SERIF:
+        font_type = "serif"
+    else:
+        font_type = "sans"  # Default
 
-        page = doc[page_num]
-        shape = page.new_shape()
+    return font_type, bool(attrs & _ATTR_BOLD), bool(attrs & _ATTR_ITALIC)
 
-        rect = fitz.Rect(x0, y0, x1, y1)
 
-        if shape_type == "rect":
-            shape.draw_rect(rect)
-        elif shape_type == "ellipse":
-            shape.draw_oval(rect)
-        elif shape_type == "line":
-            shape.draw_line(fitz.Point(x0, y1), fitz.Point(x1, y0))
+# Font types encoded as ints for scoring; serif and sans sort below mono so
+# "is serif or sans" is a single comparison
+_TYPE_SERIF = 0
+_TYPE_SANS = 1
+_TYPE_MONO = 2
+_TYPE_ID = {"serif": _TYPE_SERIF, "sans": _TYPE_SANS, "mono": _TYPE_MONO}
+
+# (name_lower, name_title, type_id, is_bold, is_italic) per system font, built once
+_SYSTEM_FONTS_LIST = tuple(
+    (name, name.title(), _TYPE_ID[props["type"]], props["weight"] == "bold", props["style"] == "italic")
+    for name, props in _SYSTEM_FONTS.items()
+)
+
+
+@lru_cache(maxsize=None)
+def _base_similarities(pdf_type: str, pdf_bold: bool, pdf_italic: bool) -> tuple:
+    """
+    Type/weight/style similarity of a PDF font to every system font.
+
+    Depends only on three small enums, so each combination is scored once
+    per process and reused for every font that shares it.
+    """
+    pdf_type_id = _TYPE_ID[pdf_type]
+    # A serif/sans mismatch still earns a little; mono vs anything earns nothing
+    cross_type = pdf_type_id < _TYPE_MONO
+    scores = []
+    for _, _, sys_type_id, sys_bold, sys_italic in _SYSTEM_FONTS_LIST:
+        # Type match is most important (50%), weight and style 25% each
+        if sys_type_id == pdf_type_id:
+            similarity = 0.5
+        elif cross_type and sys_type_id < _TYPE_MONO:
+            similarity = 0.1
         else:
-            result["message"] = f"Unknown shape type: {shape_type}"
-            doc.close()
-            return result
+            similarity = 0.0
+        similarity += 0.25 if pdf_bold == sys_bold else 0.1
+        similarity += 0.25 if pdf_italic == sys_italic else 0.1
+        scores.append(similarity)
+    return tuple(scores)
 
-        shape.finish(
-            color=stroke_color,
-            fill=fill_color,
-            width=stroke_width,
-        )
-        shape.commit()
 
-        doc.save(output_path)
-        doc.close()
+_SYSTEM_FONT_NAMES = tuple(entry[0] for entry in _SYSTEM_FONTS_LIST)
 
-        result["success"] = True
-        result["message"] = f"Shape drawn"
+# Name similarity adds up to 30%; rapidfuzz scores below the cutoff add nothing
+_NAME_BONUS = 0.3
+_NAME_MATCH_CUTOFF = 60
 
-    except Exception as e:
-        result["message"] = str(e)
 
-    return result
+def _name_bonuses(pdf_name: str) -> list:
+    """
+    Name-similarity bonus of a lowercased PDF font name per system font.
 
+    With rapidfuzz the bonus is graded by partial_ratio (a substring match
+    still scores the full bonus); without it, only substring matches count.
+    """
+    if fuzz is not None:
+        bonuses = [0.0] * len(_SYSTEM_FONT_NAMES)
+        for _, score, index in fuzz_process.extract(
+            pdf_name,
+            _SYSTEM_FONT_NAMES,
+            scorer=fuzz.partial_ratio,
+            limit=None,
+            score_cutoff=_NAME_MATCH_CUTOFF,
+        ):
+            bonuses[index] = _NAME_BONUS * score / 100
+        return bonuses
+
+    return [
+        _NAME_BONUS if sys_name in pdf_name or pdf_name in sys_name else 0.0
+        for sys_name in _SYSTEM_FONT_NAMES
+    ]
+
+
+@lru_cache(maxsize=1024)
+def _score_matches(name_lower: str, pdf_type: str, bold: bool, italic: bool) -> tuple:
+    """
+    Top three (system font title, similarity %) pairs for a font signature.
 
-def analyze_fonts(input_path: Path) -> dict:
+    Common fonts (ArialMT, TimesNewRomanPSMT, ...) recur across documents,
+    so a long-lived worker scores each signature only once.
+    """
+    base_scores = _base_similarities(pdf_type, bold, italic)
+    bonuses = _name_bonuses(name_lower)
+
+    scored = []
+    for (_, sys_title, *_), similarity, bonus in zip(_SYSTEM_FONTS_LIST, base_scores, bonuses):
+        # Bonus for name similarity
+        if bonus:
+            similarity = min(1.0, similarity + bonus)
+        scored.append((sys_title, round(similarity * 100)))
+
+    # Top 3 by similarity; nlargest keeps ties in font-table order like sort()
+    return tuple(heapq.nlargest(3, scored, key=itemgetter(1)))
+
+
+def _find_best_matches(font_info: dict) -> list:
+    """Find the three best matching system fonts for a PDF font."""
+    scored = _score_matches(
+        font_info["name"].lower(),
+        font_info["type"],
+        bool(font_info.get("bold")),
+        bool(font_info.get("italic")),
+    )
+    return [{"name": name, "similarity": similarity} for name, similarity in scored]
+
+
+# Pages sampled by analyze_fonts(quick=True) to recognise a scanned PDF
+_SCAN_SAMPLE_PAGES = 3
+
+
+def _looks_scanned(doc: fitz.Document) -> bool:
+    """True if the first pages carry images but no fonts at all."""
+    sample = range(min(len(doc), _SCAN_SAMPLE_PAGES))
+    return bool(sample) and all(
+        not doc.get_page_fonts(pno) and doc.get_page_images(pno)
+        for pno in sample
+    )
+
+
+def analyze_fonts(input_path: Path, quick: bool = False) -> dict:
     """
     Analyze fonts used in a PDF document.
 
@@ -1236,6 +2048,10 @@ def analyze_fonts(input_path: Path) -> dict:
     - Whether it's embedded/subset
     - System font availability
     - Suggested alternatives with similarity scores
+
+    With quick=True, a document whose first pages are image-only (a scan)
+    returns an empty font list with "scanned": True instead of walking
+    every page; text added later in such a file is not reported.
     """
     result = {
         "success": False,
@@ -1249,183 +2065,87 @@ def analyze_fonts(input_path: Path) -> dict:
         "error": None,
     }
 
-    # Known system fonts and their properties for matching
-    SYSTEM_FONTS = {
-        # Serif fonts
-        "times new roman": {"type": "serif", "weight": "normal", "style": "normal"},
-        "times": {"type": "serif", "weight": "normal", "style": "normal"},
-        "georgia": {"type": "serif", "weight": "normal", "style": "normal"},
-        "palatino": {"type": "serif", "weight": "normal", "style": "normal"},
-        "garamond": {"type": "serif", "weight": "normal", "style": "normal"},
-        "cambria": {"type": "serif", "weight": "normal", "style": "normal"},
-        "book antiqua": {"type": "serif", "weight": "normal", "style": "normal"},
-        "liberation serif": {"type": "serif", "weight": "normal", "style": "normal"},
-        "dejavu serif": {"type": "serif", "weight": "normal", "style": "normal"},
-        "noto serif": {"type": "serif", "weight": "normal", "style": "normal"},
-        "tiro": {"type": "serif", "weight": "normal", "style": "normal"},
-
-        # Sans-serif fonts
-        "arial": {"type": "sans", "weight": "normal", "style": "normal"},
-        "helvetica": {"type": "sans", "weight": "normal", "style": "normal"},
-        "verdana": {"type": "sans", "weight": "normal", "style": "normal"},
-        "tahoma": {"type": "sans", "weight": "normal", "style": "normal"},
-        "calibri": {"type": "sans", "weight": "normal", "style": "normal"},
-        "trebuchet ms": {"type": "sans", "weight": "normal", "style": "normal"},
-        "liberation sans": {"type": "sans", "weight": "normal", "style": "normal"},
-        "dejavu sans": {"type": "sans", "weight": "normal", "style": "normal"},
-        "noto sans": {"type": "sans", "weight": "normal", "style": "normal"},
-        "helv": {"type": "sans", "weight": "normal", "style": "normal"},
-
-        # Monospace fonts
-        "courier": {"type": "mono", "weight": "normal", "style": "normal"},
-        "courier new": {"type": "mono", "weight": "normal", "style": "normal"},
-        "consolas": {"type": "mono", "weight": "normal", "style": "normal"},
-        "monaco": {"type": "mono", "weight": "normal", "style": "normal"},
-        "liberation mono": {"type": "mono", "weight": "normal", "style": "normal"},
-        "dejavu sans mono": {"type": "mono", "weight": "normal", "style": "normal"},
-        "noto mono": {"type": "mono", "weight": "normal", "style": "normal"},
-        "cour": {"type": "mono", "weight": "normal", "style": "normal"},
-    }
-
-    def get_font_type(font_name: str, flags: int) -> str:
-        """Determine font type from name and flags."""
-        name_lower = font_name.lower()
-
-        # Check name first
-        if any(x in name_lower for x in ["courier", "mono", "consol", "fixed"]):
-            return "mono"
-        if any(x in name_lower for x in ["times", "roman", "serif", "georgia", "palatino", "garamond"]):
-            if "sans" not in name_lower:
-                return "serif"
-        if any(x in name_lower for x in ["arial", "helv", "helvetica", "verdana", "calibri", "sans", "gothic"]):
-            return "sans"
-
-        # Fall back to flags
-        # bit 2 = serif, bit 3 = monospace
-        if flags & (1 << 3):  # monospace
-            return "mono"
-        if flags & (1 << 2):  # serif
-            return "serif"
-
-        return "sans"  # Default
-
-    def calculate_similarity(pdf_font: dict, system_font: dict) -> float:
-        """Calculate similarity score between PDF font and system font."""
-        score = 0.0
-
-        # Type match is most important (50%)
-        if pdf_font["type"] == system_font["type"]:
-            score += 0.5
-        elif pdf_font["type"] == "serif" and system_font["type"] == "sans":
-            score += 0.1  # Low match
-        elif pdf_font["type"] == "sans" and system_font["type"] == "serif":
-            score += 0.1
-
-        # Weight match (25%)
-        if pdf_font.get("bold") == (system_font.get("weight") == "bold"):
-            score += 0.25
-        else:
-            score += 0.1
-
-        # Style match (25%)
-        if pdf_font.get("italic") == (system_font.get("style") == "italic"):
-            score += 0.25
-        else:
-            score += 0.1
-
-        return score
-
-    def find_best_matches(font_info: dict) -> list:
-        """Find best matching system fonts."""
-        matches = []
-
-        for sys_name, sys_props in SYSTEM_FONTS.items():
-            similarity = calculate_similarity(font_info, sys_props)
-
-            # Bonus for name similarity
-            pdf_name = font_info["name"].lower()
-            if sys_name in pdf_name or pdf_name in sys_name:
-                similarity = min(1.0, similarity + 0.3)
-
-            matches.append({
-                "name": sys_name.title(),
-                "similarity": round(similarity * 100),
-            })
-
-        # Sort by similarity and return top 3
-        matches.sort(key=lambda x: x["similarity"], reverse=True)
-        return matches[:3]
-
     try:
-        doc = fitz.open(input_path)
-
-        # Collect all fonts from all pages
-        all_fonts = {}  # font_name -> font_info
+        doc = _open_document(input_path)
 
-        for page_num in range(len(doc)):
-            page = doc[page_num]
-
-            # Get fonts used on this page
-            font_list = page.get_fonts(full=True)
-
-            for font in font_list:
-                # font tuple: (xref, ext, type, basefont, name, encoding, ref_name)
-                xref, ext, font_type, basefont, name, encoding, ref_name = font[:7] if len(font) >= 7 else (font + (None,) * (7 - len(font)))
-
-                # Use basefont or name
-                font_name = basefont or name or f"Unknown-{xref}"
-
-                # Clean up font name (remove subset prefix like ABCDEF+)
-                clean_name = font_name
-                if "+" in font_name:
-                    clean_name = font_name.split("+", 1)[1]
+        if quick and _looks_scanned(doc):
+            result["success"] = True
+            result["scanned"] = True
+            _release_document(doc)
+            return result
 
-                if clean_name not in all_fonts:
-                    all_fonts[clean_name] = {
-                        "original_name": font_name,
-                        "clean_name": clean_name,
-                        "xref": xref,
-                        "type": font_type,
-                        "encoding": encoding,
-                        "pages": [],
-                        "is_subset": "+" in font_name,
-                        "is_embedded": ext not in ["", None, "n/a"],
-                    }
+        # Collect each font object once by xref (globally unique); the page
+        # walk itself only records which pages use it
+        by_xref = {}  # xref -> first font tuple seen
+        pages_by_xref = defaultdict(list)  # xref -> 1-based page numbers
 
-                if page_num + 1 not in all_fonts[clean_name]["pages"]:
-                    all_fonts[clean_name]["pages"].append(page_num + 1)
+        for page_num in range(len(doc)):
+            page_no = page_num + 1
+            # full=False: the referencing xref (the 7th item) is never used
+            for font in doc.get_page_fonts(page_num, full=False):
+                pages = pages_by_xref[font[0]]
+                if not pages:
+                    by_xref[font[0]] = font
+                    pages.append(page_no)
+                elif pages[-1] != page_no:
+                    pages.append(page_no)
+
+        # Merge xrefs sharing a clean name (e.g. several subsets of one font)
+        # into parallel per-font columns instead of a dict per font
+        row_by_name = {}  # clean name -> row index
+        names = []
+        original_names = []
+        font_pages = []  # sorted 1-based page numbers
+        subset_flags = []
+        embedded_flags = []
+        for xref, font in by_xref.items():
+            # font tuple: (xref, ext, type, basefont, name, encoding)
+            _, ext, _, basefont, name, *_ = font + (None,) * 6
+
+            # Use basefont or name
+            font_name = basefont or name or f"Unknown-{xref}"
+
+            # Clean up font name (remove subset prefix like ABCDEF+)
+            _, subset_sep, rest = font_name.partition("+")
+            clean_name = rest if subset_sep else font_name
+
+            row = row_by_name.get(clean_name)
+            if row is None:
+                row_by_name[clean_name] = len(names)
+                names.append(clean_name)
+                original_names.append(font_name)
+                font_pages.append(pages_by_xref[xref])
+                subset_flags.append(bool(subset_sep))
+                embedded_flags.append(ext not in ("", None, "n/a"))
+            else:
+                font_pages[row] = sorted(set(font_pages[row]).union(pages_by_xref[xref]))
 
         # Analyze each font
         fonts_list = []
         missing_count = 0
         low_match_count = 0
-        embedded_count = 0
+        embedded_count = sum(embedded_flags)
 
-        for font_name, font_data in all_fonts.items():
-            # Determine font properties
-            name_lower = font_name.lower()
-
-            # Detect bold/italic from name
-            is_bold = any(x in name_lower for x in ["bold", "black", "heavy", "demi"])
-            is_italic = any(x in name_lower for x in ["italic", "oblique", "slant"])
-
-            # Detect font type
-            font_type = get_font_type(font_name, 0)
+        for font_name, original_name, pages, is_subset, is_embedded in zip(
+            names, original_names, font_pages, subset_flags, embedded_flags
+        ):
+            # Detect type and bold/italic from the name in one pass
+            font_type, is_bold, is_italic = _classify_font_name(font_name)
 
             font_info = {
                 "name": font_name,
-                "originalName": font_data["original_name"],
+                "originalName": original_name,
                 "type": font_type,
                 "bold": is_bold,
                 "italic": is_italic,
-                "embedded": font_data["is_embedded"],
-                "subset": font_data["is_subset"],
-                "pages": font_data["pages"],
-                "pageCount": len(font_data["pages"]),
+                "embedded": is_embedded,
+                "subset": is_subset,
+                "pages": pages,
+                "pageCount": len(pages),
             }
 
             # Find best matches
-            matches = find_best_matches(font_info)
+            matches = _find_best_matches(font_info)
             font_info["matches"] = matches
             font_info["bestMatch"] = matches[0] if matches else None
             font_info["bestMatchScore"] = matches[0]["similarity"] if matches else 0
@@ -1434,15 +2154,12 @@ def analyze_fonts(input_path: Path) -> dict:
             if font_info["bestMatchScore"] < 85:
                 low_match_count += 1
                 font_info["status"] = "low_match"
-            elif not font_data["is_embedded"]:
+            elif not is_embedded:
                 missing_count += 1
                 font_info["status"] = "missing"
             else:
                 font_info["status"] = "ok"
 
-            if font_data["is_embedded"]:
-                embedded_count += 1
-
             fonts_list.append(font_info)
 
         # Sort by page count (most used first)
@@ -1457,7 +2174,7 @@ def analyze_fonts(input_path: Path) -> dict:
             "low_match": low_match_count,
         }
 
-        doc.close()
+        _release_document(doc)
 
     except Exception as e:
         result["error"] = str(e)
@@ -1465,6 +2182,59 @@ def analyze_fonts(input_path: Path) -> dict:
     return result
 
 
+# Commands accepted by serve(), called with the request's "args" as keywords
+_SERVE_COMMANDS = {
+    "text-blocks": get_text_blocks,
+    "all-text-blocks": get_all_text_blocks,
+    "insert-text": insert_text,
+    "replace-text": replace_text_area,
+    "apply-edits": apply_edits,
+    "draw-shapes": draw_shapes,
+    "preview": render_page_preview,
+    "text-blocks-fonts": get_text_blocks_with_fonts,
+    "analyze-fonts": analyze_fonts,
+}
+
+
+def serve(stdin=sys.stdin, stdout=sys.stdout) -> None:
+    """
+    Answer newline-delimited JSON requests until stdin closes.
+
+    Each request is {"command": ..., "args": {...}, "id": ...} with a
+    command from _SERVE_COMMANDS; each reply is one JSON line carrying the
+    command's result dict and the request id. Read-only commands reuse
+    up to 8 open documents, so a long-lived worker parses each PDF once.
+    """
+    global _document_cache_enabled
+    _document_cache_enabled = True
+
+    for line in stdin:
+        if not line.strip():
+            continue
+        request_id = None
+        try:
+            request = _json_loads(line)
+            request_id = request.get("id")
+            command = request.get("command")
+            args = request.get("args", {})
+            func = _SERVE_COMMANDS.get(command)
+            if func is None:
+                result = {"success": False, "error": f"Unknown command: {command}"}
+            elif str(args.get("output_path")) == "-" or args.get("raw"):
+                # stdout carries the replies; PDF or image bytes would
+                # corrupt the stream
+                result = {"success": False, "error": "Binary output is not supported in serve mode"}
+            else:
+                result = func(**args)
+            result["id"] = request_id
+            reply = _json_dumps(result)
+        except Exception as e:
+            reply = _json_dumps({"success": False, "error": str(e), "id": request_id})
+
+        stdout.write(reply + "\n")
+        stdout.flush()
+
+
 def main():
     parser = argparse.ArgumentParser(description="PDF Edit operations")
     subparsers = parser.add_subparsers(dest="command", required=True)
@@ -1473,8 +2243,16 @@ def main():
     blocks_parser = subparsers.add_parser("text-blocks", help="Get text blocks from page")
     blocks_parser.add_argument("--input", "-i", required=True, help="Input PDF path")
     blocks_parser.add_argument("--page", "-p", type=int, required=True, help="Page number (0-indexed)")
+    blocks_parser.add_argument("--no-spans", action="store_true", help="Only block text and geometry")
     blocks_parser.add_argument("--json", action="store_true", help="Output as JSON")
 
+    # All text blocks command
+    all_blocks_parser = subparsers.add_parser("all-text-blocks", help="Get text blocks from all pages")
+    all_blocks_parser.add_argument("--input", "-i", required=True, help="Input PDF path")
+    all_blocks_parser.add_argument("--workers", type=int, default=1, help="Extract in a process pool of this size (large documents)")
+    all_blocks_parser.add_argument("--no-spans", action="store_true", help="Only block text and geometry")
+    all_blocks_parser.add_argument("--json", action="store_true", help="Output as JSON")
+
     # Insert text command
     insert_parser = subparsers.add_parser("insert-text", help="Insert text")
     insert_parser.add_argument("--input", "-i", required=True, help="Input PDF path")
@@ -1490,20 +2268,24 @@ def main():
     # Replace text command
     replace_parser = subparsers.add_parser("replace-text", help="Replace text in area")
     replace_parser.add_argument("--input", "-i", required=True, help="Input PDF path")
-    replace_parser.add_argument("--output", "-o", required=True, help="Output PDF path")
+    replace_parser.add_argument("--output", "-o", required=True, help="Output PDF path (- for stdout)")
     replace_parser.add_argument("--page", "-p", type=int, required=True, help="Page number")
     replace_parser.add_argument("--x0", type=float, required=True)
     replace_parser.add_argument("--y0", type=float, required=True)
     replace_parser.add_argument("--x1", type=float, required=True)
     replace_parser.add_argument("--y1", type=float, required=True)
     replace_parser.add_argument("--text", "-t", required=True, help="New text")
+    replace_parser.add_argument("--optimize", action="store_true", help="Fully compact the output (slower save)")
     replace_parser.add_argument("--json", action="store_true", help="Output as JSON")
 
     # Apply edits batch command
     apply_parser = subparsers.add_parser("apply-edits", help="Apply multiple edits from JSON")
     apply_parser.add_argument("--input", "-i", required=True, help="Input PDF path")
-    apply_parser.add_argument("--output", "-o", required=True, help="Output PDF path")
+    apply_parser.add_argument("--output", "-o", required=True, help="Output PDF path (- for stdout)")
     apply_parser.add_argument("--edits", "-e", required=True, help="JSON string with edit operations")
+    apply_parser.add_argument("--optimize", action="store_true", help="Fully compact the output (slower save)")
+    apply_parser.add_argument("--incremental", action="store_true", help="Skip garbage collection for small edits")
+    apply_parser.add_argument("--fast", action="store_true", help="Skip garbage collection and compression (previews, dry runs)")
     apply_parser.add_argument("--json", action="store_true", help="Output as JSON")
 
     # Preview command - render page with edits as PNG
@@ -1512,25 +2294,37 @@ def main():
     preview_parser.add_argument("--page", "-p", type=int, required=True, help="Page number (0-indexed)")
     preview_parser.add_argument("--edits", "-e", default="{}", help="JSON string with edit operations")
     preview_parser.add_argument("--dpi", type=int, default=150, help="Render DPI")
+    preview_parser.add_argument("--format", default="png", choices=["png", "jpg"], help="Preview image format")
+    preview_parser.add_argument("--quality", type=int, default=80, help="JPEG quality (1-100)")
+    preview_parser.add_argument("--raw", action="store_true", help="Write an 8-byte little-endian length and the image bytes to stdout")
     preview_parser.add_argument("--json", action="store_true", help="Output as JSON")
 
     # Text blocks with fonts command
     fonts_parser = subparsers.add_parser("text-blocks-fonts", help="Get text blocks with font info")
     fonts_parser.add_argument("--input", "-i", required=True, help="Input PDF path")
     fonts_parser.add_argument("--page", "-p", type=int, required=True, help="Page number (0-indexed)")
+    fonts_parser.add_argument("--no-cache", action="store_true", help="Bypass the on-disk result cache")
     fonts_parser.add_argument("--json", action="store_true", help="Output as JSON")
 
     # Analyze fonts command
     analyze_parser = subparsers.add_parser("analyze-fonts", help="Analyze fonts in PDF")
     analyze_parser.add_argument("--input", "-i", required=True, help="Input PDF path")
+    analyze_parser.add_argument("--quick", action="store_true", help="Skip the page walk for scanned (image-only) PDFs")
     analyze_parser.add_argument("--json", action="store_true", help="Output as JSON")
 
+    # Persistent worker: JSON requests on stdin, one JSON reply per line
+    subparsers.add_parser("serve", help="Serve JSON requests from stdin")
+
     args = parser.parse_args()
 
+    if args.command == "serve":
+        serve()
+        return
+
     if args.command == "text-blocks":
-        result = get_text_blocks(Path(args.input), args.page)
+        result = get_text_blocks(Path(args.input), args.page, spans=not args.no_spans)
         if hasattr(args, 'json') and args.json:
-            print(json.dumps(result))
+            print(_json_dumps(result))
         else:
             if result["success"]:
                 print(f"Found {len(result['blocks'])} text blocks on page {args.page + 1}")
@@ -1540,6 +2334,18 @@ def main():
                 print(f"Error: {result['error']}")
                 sys.exit(1)
 
+    elif args.command == "all-text-blocks":
+        result = get_all_text_blocks(Path(args.input), num_workers=args.workers, spans=not args.no_spans)
+        if hasattr(args, 'json') and args.json:
+            print(_json_dumps(result))
+        else:
+            if result["success"]:
+                for page in result["pages"]:
+                    print(f"Page {page['page'] + 1}: {len(page['blocks'])} text blocks")
+            else:
+                print(f"Error: {result['error']}")
+                sys.exit(1)
+
     elif args.command == "insert-text":
         result = insert_text(
             Path(args.input),
@@ -1552,7 +2358,7 @@ def main():
             args.size,
         )
         if hasattr(args, 'json') and args.json:
-            print(json.dumps(result))
+            print(_json_dumps(result))
         else:
             print(result["message"])
             sys.exit(0 if result["success"] else 1)
@@ -1567,11 +2373,14 @@ def main():
             args.x1,
             args.y1,
             args.text,
+            optimize=args.optimize,
         )
+        # With "-" the PDF itself went to stdout; report on stderr instead
+        report = sys.stderr if args.output == "-" else sys.stdout
         if hasattr(args, 'json') and args.json:
-            print(json.dumps(result))
+            print(_json_dumps(result), file=report)
         else:
-            print(result["message"])
+            print(result["message"], file=report)
             sys.exit(0 if result["success"] else 1)
 
     elif args.command == "apply-edits":
@@ -1579,11 +2388,16 @@ def main():
             Path(args.input),
             Path(args.output),
             args.edits,
+            optimize=args.optimize,
+            incremental=args.incremental,
+            fast=args.fast,
         )
+        # With "-" the PDF itself went to stdout; report on stderr instead
+        report = sys.stderr if args.output == "-" else sys.stdout
         if hasattr(args, 'json') and args.json:
-            print(json.dumps(result))
+            print(_json_dumps(result), file=report)
         else:
-            print(result["message"])
+            print(result["message"], file=report)
             sys.exit(0 if result["success"] else 1)
 
     elif args.command == "preview":
@@ -1592,9 +2406,21 @@ def main():
             args.page,
             args.edits,
             args.dpi,
+            image_format=args.format,
+            quality=args.quality,
+            raw=args.raw,
         )
-        if hasattr(args, 'json') and args.json:
-            print(json.dumps(result))
+        if args.raw:
+            # Binary framing: no base64 or JSON quoting on either side of the pipe
+            if not result["success"]:
+                print(f"Error: {result['error']}", file=sys.stderr)
+                sys.exit(1)
+            image_bytes = result["image_bytes"]
+            sys.stdout.buffer.write(len(image_bytes).to_bytes(8, "little"))
+            sys.stdout.buffer.write(image_bytes)
+            sys.stdout.buffer.flush()
+        elif hasattr(args, 'json') and args.json:
+            print(_json_dumps(result))
         else:
             if result["success"]:
                 print(f"Preview rendered: {result['width']}x{result['height']}")
@@ -1604,9 +2430,9 @@ def main():
                 sys.exit(1)
 
     elif args.command == "text-blocks-fonts":
-        result = get_text_blocks_with_fonts(Path(args.input), args.page)
+        result = get_text_blocks_with_fonts(Path(args.input), args.page, use_cache=not args.no_cache)
         if hasattr(args, 'json') and args.json:
-            print(json.dumps(result))
+            print(_json_dumps(result))
         else:
             if result["success"]:
                 print(f"Found {len(result['blocks'])} text blocks with font info")
@@ -1618,9 +2444,9 @@ def main():
                 sys.exit(1)
 
     elif args.command == "analyze-fonts":
-        result = analyze_fonts(Path(args.input))
+        result = analyze_fonts(Path(args.input), quick=args.quick)
         if hasattr(args, 'json') and args.json:
-            print(json.dumps(result))
+            print(_json_dumps(result))
         else:
             if result["success"]:
                 summary = result["summary"]
@@ -4,10 +4,17 @@ PDF Form Fields (AcroForms) handling using PyMuPDF.
 Supports reading, filling, and saving form fields.
 """
 
+import re
 import sys
 import json
+from itertools import chain
 import fitz  # PyMuPDF
 
+try:
+    from utils import is_same_file
+except ImportError:
+    from .utils import is_same_file
+
 # Field type constants from PyMuPDF (verified with fitz.PDF_WIDGET_TYPE_*)
 FIELD_TYPES = {
     0: "unknown",       # PDF_WIDGET_TYPE_UNKNOWN
@@ -26,10 +33,151 @@ def get_field_type_name(field_type: int) -> str:
     return FIELD_TYPES.get(field_type, "unknown")
 
 
-def list_form_fields(pdf_path: str) -> dict:
+# Field flag bits (PDF 1.7, section 12.7.3.1 / 12.7.4)
+_FF_READ_ONLY = 1 << 0
+_FF_MULTILINE = 1 << 12
+_FF_RADIO = 1 << 15
+_FF_PUSHBUTTON = 1 << 16
+_FF_COMBO = 1 << 17
+
+_XREF_RE = re.compile(r"(\d+) 0 R")
+# Tokens of a serialized /Opt array: brackets, literal and hex strings
+_PDF_OPT_TOKEN_RE = re.compile(r"\[|\]|\((?:\\.|[^\\)])*\)|<[0-9A-Fa-f\s]*>")
+
+
+def _field_type_id(field_type: str, flags: int) -> int:
+    """Map a field's /FT name and /Ff flags to a PDF_WIDGET_TYPE_* id."""
+    if field_type == "/Tx":
+        return fitz.PDF_WIDGET_TYPE_TEXT
+    if field_type == "/Btn":
+        if flags & _FF_PUSHBUTTON:
+            return fitz.PDF_WIDGET_TYPE_BUTTON
+        if flags & _FF_RADIO:
+            return fitz.PDF_WIDGET_TYPE_RADIOBUTTON
+        return fitz.PDF_WIDGET_TYPE_CHECKBOX
+    if field_type == "/Ch":
+        return fitz.PDF_WIDGET_TYPE_COMBOBOX if flags & _FF_COMBO else fitz.PDF_WIDGET_TYPE_LISTBOX
+    if field_type == "/Sig":
+        return fitz.PDF_WIDGET_TYPE_SIGNATURE
+    return 0
+
+
+def _choice_export_values(options: str) -> list:
+    """
+    Decode a serialized /Opt array into its export values.
+
+    Elements are strings or [export display] pairs; a pair yields its
+    export value. The strings are decoded by MuPDF (escapes, hex,
+    UTF-16) from a scratch object, like any other string value.
+    """
+    tokens = []
+    depth = 0
+    want_export = False
+    for token in _PDF_OPT_TOKEN_RE.findall(options):
+        if token == "[":
+            depth += 1
+            want_export = True
+        elif token == "]":
+            depth -= 1
+        elif depth == 1 or (depth == 2 and want_export):
+            tokens.append(token)
+            want_export = False
+
+    if not tokens:
+        return []
+
+    scratch = fitz.open()
+    try:
+        xref = scratch.get_new_xref()
+        scratch.update_object(xref, "<<" + "".join(f"/K{i} {t}" for i, t in enumerate(tokens)) + ">>")
+        return [scratch.xref_get_key(xref, f"K{i}")[1] for i in range(len(tokens))]
+    finally:
+        scratch.close()
+
+
+def _catalog_fields(doc: fitz.Document) -> list:
+    """
+    Read terminal fields straight from the AcroForm /Fields tree.
+
+    One xref lookup per field object, no page or widget loading. Pages,
+    rects and button on-states live on the widgets, so they are omitted.
+    """
+    kind, value = doc.xref_get_key(doc.pdf_catalog(), "AcroForm/Fields")
+    if kind != "array":
+        raise ValueError("AcroForm has no /Fields array")
+
+    fields = []
+    # (xref, parent name, inherited /FT /Ff /V)
+    stack = [(int(x), "", {}) for x in reversed(_XREF_RE.findall(value))]
+
+    while stack:
+        xref, prefix, inherited = stack.pop()
+
+        attrs = dict(inherited)
+        for key in ("FT", "Ff", "V"):
+            kind, value = doc.xref_get_key(xref, key)
+            if kind != "null":
+                attrs[key] = (kind, value)
+
+        kind, partial = doc.xref_get_key(xref, "T")
+        name = prefix
+        if kind != "null":
+            name = f"{prefix}.{partial}" if prefix else partial
+
+        # Kids carrying their own /T are child fields; the rest are widgets
+        kind, kids = doc.xref_get_key(xref, "Kids")
+        if kind == "array":
+            child_fields = [
+                int(x) for x in _XREF_RE.findall(kids)
+                if doc.xref_get_key(int(x), "T")[0] != "null"
+            ]
+            if child_fields:
+                stack.extend((x, name, attrs) for x in reversed(child_fields))
+                continue
+
+        flags = int(attrs["Ff"][1]) if "Ff" in attrs else 0
+        type_id = _field_type_id(attrs.get("FT", ("null", ""))[1], flags)
+        value_kind, value = attrs.get("V", ("null", None))
+        if value_kind == "name":
+            value = value.lstrip("/")
+        elif value_kind == "null":
+            value = None
+
+        field_info = {
+            "name": name or f"unnamed_{len(fields)}",
+            "type": get_field_type_name(type_id),
+            "type_id": type_id,
+            "value": value,
+            "flags": flags,
+            "read_only": bool(flags & _FF_READ_ONLY),
+        }
+
+        if type_id in (fitz.PDF_WIDGET_TYPE_LISTBOX, fitz.PDF_WIDGET_TYPE_COMBOBOX):
+            kind, options = doc.xref_get_key(xref, "Opt")
+            field_info["choices"] = _choice_export_values(options) if kind == "array" else []
+
+        if type_id == fitz.PDF_WIDGET_TYPE_CHECKBOX:
+            field_info["checked"] = value not in (None, "Off")
+
+        if type_id == fitz.PDF_WIDGET_TYPE_TEXT:
+            kind, max_len = doc.xref_get_key(xref, "MaxLen")
+            field_info["max_length"] = int(max_len) if kind == "int" else 0
+            field_info["multiline"] = bool(flags & _FF_MULTILINE)
+
+        fields.append(field_info)
+
+    return fields
+
+
+def list_form_fields(pdf_path: str, include_geometry: bool = True) -> dict:
     """
     List all form fields in a PDF.
     Returns a dict with fields grouped by page.
+
+    With include_geometry=False the fields are read from the AcroForm
+    catalog entry instead of walking every page's widgets, and page, rect
+    and button on-state details are left out. Falls back to the page walk
+    if the catalog cannot be read.
     """
     doc = fitz.open(pdf_path)
 
@@ -37,13 +185,24 @@ def list_form_fields(pdf_path: str) -> dict:
         doc.close()
         return {"is_form": False, "fields": [], "field_count": 0}
 
+    if not include_geometry:
+        try:
+            fields = _catalog_fields(doc)
+        except Exception:
+            fields = None  # Fall back to the per-page widget walk
+        if fields is not None:
+            doc.close()
+            return {
+                "is_form": True,
+                "fields": fields,
+                "field_count": len(fields),
+            }
+
     fields = []
 
     for page_num in range(len(doc)):
         page = doc[page_num]
-        widget = page.first_widget
-
-        while widget:
+        for widget in page.widgets():
             field_info = {
                 "name": widget.field_name or f"unnamed_{page_num}_{len(fields)}",
                 "type": get_field_type_name(widget.field_type),
@@ -74,7 +233,6 @@ def list_form_fields(pdf_path: str) -> dict:
                 field_info["multiline"] = bool(widget.field_flags & (1 << 12))
 
             fields.append(field_info)
-            widget = widget.next
 
     doc.close()
 
@@ -85,7 +243,12 @@ def list_form_fields(pdf_path: str) -> dict:
     }
 
 
-def fill_form_fields(pdf_path: str, output_path: str, field_values: dict) -> dict:
+def fill_form_fields(
+    pdf_path: str,
+    output_path: str,
+    field_values: dict,
+    incremental: bool = False,
+) -> dict:
     """
     Fill form fields and save to a new file.
 
@@ -93,6 +256,10 @@ def fill_form_fields(pdf_path: str, output_path: str, field_values: dict) -> dic
         pdf_path: Path to source PDF
         output_path: Path to save filled PDF
         field_values: Dict mapping field names to values
+        incremental: Write a new file without garbage collection. Saving
+            over the source is always an incremental append.
+
+    An output_path of "-" writes the filled PDF bytes to stdout.
 
     Returns:
         Dict with success status and filled field count
@@ -105,47 +272,59 @@ def fill_form_fields(pdf_path: str, output_path: str, field_values: dict) -> dic
 
     filled_count = 0
     errors = []
-
-    for page in doc:
-        widget = page.first_widget
-
-        while widget:
-            field_name = widget.field_name
-
-            if field_name in field_values:
-                try:
-                    value = field_values[field_name]
-
-                    # Handle different field types (using fitz constants)
-                    if widget.field_type == fitz.PDF_WIDGET_TYPE_CHECKBOX:  # 2
-                        if value is True or value == widget.on_state():
-                            widget.field_value = widget.on_state()
-                        else:
-                            widget.field_value = False
-
-                    elif widget.field_type == fitz.PDF_WIDGET_TYPE_RADIOBUTTON:  # 5
-                        if value == widget.on_state():
-                            widget.field_value = widget.on_state()
-
-                    elif widget.field_type in (fitz.PDF_WIDGET_TYPE_LISTBOX, fitz.PDF_WIDGET_TYPE_COMBOBOX):  # 4, 3
-                        if value in (widget.choice_values or []):
-                            widget.field_value = value
-                        else:
-                            errors.append(f"Invalid choice for {field_name}: {value}")
-
-                    else:  # text and other fields
-                        widget.field_value = str(value) if value is not None else ""
-
-                    widget.update()
-                    filled_count += 1
-
-                except Exception as e:
-                    errors.append(f"Error filling {field_name}: {str(e)}")
-
-            widget = widget.next
-
-    # Save the filled form
-    doc.save(output_path)
+    get_value = field_values.get
+    missing = object()
+
+    for widget in chain.from_iterable(page.widgets() for page in doc):
+        field_name = widget.field_name
+        value = get_value(field_name, missing)
+
+        # Most widgets are not being filled; move on before touching them
+        if value is missing:
+            continue
+
+        try:
+            field_type = widget.field_type
+
+            # Handle different field types (using fitz constants)
+            if field_type == fitz.PDF_WIDGET_TYPE_CHECKBOX:  # 2
+                on_state = widget.on_state()
+                if value is True or value == on_state:
+                    widget.field_value = on_state
+                else:
+                    widget.field_value = False
+
+            elif field_type == fitz.PDF_WIDGET_TYPE_RADIOBUTTON:  # 5
+                on_state = widget.on_state()
+                if value == on_state:
+                    widget.field_value = on_state
+
+            elif field_type in (fitz.PDF_WIDGET_TYPE_LISTBOX, fitz.PDF_WIDGET_TYPE_COMBOBOX):  # 4, 3
+                if value in (widget.choice_values or []):
+                    widget.field_value = value
+                else:
+                    errors.append(f"Invalid choice for {field_name}: {value}")
+
+            else:  # text and other fields
+                widget.field_value = str(value) if value is not None else ""
+
+            widget.update()
+            filled_count += 1
+
+        except Exception as e:
+            errors.append(f"Error filling {field_name}: {str(e)}")
+
+    # Save the filled form; in place only the changed widgets are appended
+    if output_path == "-":
+        # Stream the PDF to the caller's pipe instead of a file
+        sys.stdout.buffer.write(doc.tobytes(garbage=0, deflate=True))
+        sys.stdout.buffer.flush()
+    elif is_same_file(pdf_path, output_path):
+        doc.save(doc.name, incremental=True, encryption=fitz.PDF_ENCRYPT_KEEP)
+    elif incremental:
+        doc.save(output_path, garbage=0, deflate=True)
+    else:
+        doc.save(output_path)
     doc.close()
 
     return {
@@ -164,26 +343,30 @@ def main():
 
     operation = sys.argv[1]
     pdf_path = sys.argv[2]
+    # "fill ... -" streams the PDF on stdout, so the JSON result goes to stderr
+    report = sys.stderr if operation == "fill" and sys.argv[3:4] == ["-"] else sys.stdout
 
     try:
         if operation == "list":
-            result = list_form_fields(pdf_path)
+            include_geometry = "--no-geometry" not in sys.argv[3:]
+            result = list_form_fields(pdf_path, include_geometry)
 
         elif operation == "fill":
             if len(sys.argv) < 5:
-                print(json.dumps({"error": "Usage: pdf_forms.py fill <pdf_path> <output_path> <json_values>"}))
+                print(json.dumps({"error": "Usage: pdf_forms.py fill <pdf_path> <output_path> <json_values> [--incremental]"}))
                 sys.exit(1)
             output_path = sys.argv[3]
             field_values = json.loads(sys.argv[4])
-            result = fill_form_fields(pdf_path, output_path, field_values)
+            incremental = "--incremental" in sys.argv[5:]
+            result = fill_form_fields(pdf_path, output_path, field_values, incremental)
 
         else:
             result = {"error": f"Unknown operation: {operation}"}
 
-        print(json.dumps(result))
+        print(json.dumps(result), file=report)
 
     except Exception as e:
-        print(json.dumps({"error": str(e)}))
+        print(json.dumps({"error": str(e)}), file=report)
         sys.exit(1)
 
 
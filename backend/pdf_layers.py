@@ -4,11 +4,13 @@ PDF Layers (Optional Content Groups) operations.
 CLI usage (dev):
   python pdf_layers.py list --input doc.pdf
   python pdf_layers.py toggle --input doc.pdf --output out.pdf --layer "Layer1" --visible true
+  echo '{"Layer1": false, "12": true}' | python pdf_layers.py batch --input doc.pdf --output out.pdf
 """
 
 from __future__ import annotations
 
 import argparse
+import shutil
 import sys
 import json
 from pathlib import Path
@@ -16,12 +18,173 @@ from typing import Optional
 
 import fitz  # PyMuPDF
 
+try:
+    from utils import is_same_file
+except ImportError:
+    from .utils import is_same_file
 
-def get_layers(input_path: Path) -> dict:
+
+def open_with_ocgs(input_path: Path) -> tuple:
+    """
+    Open a PDF and read its OCGs once.
+
+    Returns (doc, ocgs, name_to_xref); the caller owns the document.
+    """
+    doc = fitz.open(input_path)
+    ocgs = doc.get_ocgs()
+    name_to_xref = {}
+    for xref, info in ocgs.items():
+        # Duplicate names resolve to the first OCG, as a linear scan would
+        name_to_xref.setdefault(info.get("name"), xref)
+    return doc, ocgs, name_to_xref
+
+
+def _apply_layer_states(doc, states: dict) -> None:
+    """
+    Set OCG visibility in the document's default configuration.
+
+    set_layer takes complete ON/OFF lists, so layers without a queued
+    change keep their current state.
+    """
+    visible = {xref: info.get("on", True) for xref, info in doc.get_ocgs().items()}
+    visible.update(states)
+    doc.set_layer(
+        -1,
+        on=[xref for xref, on in visible.items() if on],
+        off=[xref for xref, on in visible.items() if not on],
+    )
+
+
+def _write_layer_states(input_path: Path, output_path: Path, states: dict) -> None:
+    """
+    Persist layer visibility changes to output_path.
+
+    Only the OCG configuration changes, so the update is appended as an
+    incremental save: in place when output is the input, otherwise on a
+    byte copy of the input. Falls back to a full rewrite when the file
+    cannot be saved incrementally (e.g. it needed repair on open).
+    """
+    in_place = is_same_file(input_path, output_path)
+    try:
+        if not in_place:
+            shutil.copyfile(input_path, output_path)
+        doc = fitz.open(output_path)
+        try:
+            _apply_layer_states(doc, states)
+            doc.save(doc.name, incremental=True, encryption=fitz.PDF_ENCRYPT_KEEP)
+        finally:
+            doc.close()
+        return
+    except Exception:
+        pass
+
+    data = None
+    doc = fitz.open(input_path)
+    try:
+        _apply_layer_states(doc, states)
+        if in_place:
+            # An open file can only be overwritten incrementally
+            data = doc.tobytes()
+        else:
+            doc.save(output_path)
+    finally:
+        doc.close()
+    if data is not None:
+        Path(output_path).write_bytes(data)
+
+
+class LayeredPdf:
+    """
+    A PDF opened once for a series of layer visibility changes.
+
+    Toggles are recorded against the OCG index read at open time and
+    written together by save(). Saved in place, they are applied to the
+    open document and appended incrementally, so N toggles cost one parse
+    and one write; saving to another path appends to a byte copy of the
+    file, which is parsed once more:
+
+        with LayeredPdf(path) as pdf:
+            pdf.toggle("Layer1", False)
+            pdf.toggle(12, True)
+            pdf.save(out_path)
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.doc, self.ocgs, self._name_to_xref = open_with_ocgs(path)
+        self._pending = {}
+
+    def __enter__(self) -> "LayeredPdf":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def resolve(self, key) -> Optional[int]:
+        """
+        Return the xref for a layer name or xref, or None if unknown.
+
+        A string is matched as a name first, so a layer named "2024" is
+        found by name; only digit strings that name no layer are xrefs.
+        """
+        if isinstance(key, int):
+            xref = key
+        else:
+            xref = self._name_to_xref.get(key)
+            if xref is None and key.isdigit():
+                xref = int(key)
+        return xref if xref in self.ocgs else None
+
+    def toggle(self, key, on: bool) -> bool:
+        """Queue a visibility change; returns False if the layer is unknown."""
+        xref = self.resolve(key)
+        if xref is None:
+            return False
+        self._pending[xref] = bool(on)
+        return True
+
+    def set_all(self, on: bool) -> None:
+        """Queue the same visibility for every layer."""
+        self._pending = dict.fromkeys(self.ocgs, bool(on))
+
+    @property
+    def pending(self) -> int:
+        """Number of layers with a queued change."""
+        return len(self._pending)
+
+    def save(self, output_path: Path) -> None:
+        """Write the queued changes to output_path and close the document."""
+        pending, self._pending = self._pending, {}
+        if not pending:
+            self.close()
+            return
+
+        if is_same_file(self.path, output_path):
+            try:
+                _apply_layer_states(self.doc, pending)
+                self.doc.save(self.doc.name, incremental=True, encryption=fitz.PDF_ENCRYPT_KEEP)
+                self.close()
+                return
+            except Exception:
+                pass  # e.g. repaired on open; rewrite from the file below
+
+        # The writer may append to or replace the file this handle reads
+        self.close()
+        _write_layer_states(self.path, output_path, pending)
+
+    def close(self) -> None:
+        if self.doc is not None:
+            self.doc.close()
+            self.doc = None
+
+
+def get_layers(input_path: Path, columnar: bool = False) -> dict:
     """
     Get all layers (OCGs) from a PDF.
 
-    Returns dict with layer info.
+    Returns dict with layer info. With columnar=True, "layers" is a dict of
+    parallel lists (xref, name, on, intent, usage) instead of one dict per
+    layer, which is smaller and faster to serialize for thousands of OCGs.
     """
     result = {
         "has_layers": False,
@@ -37,15 +200,26 @@ def get_layers(input_path: Path) -> dict:
 
         if ocgs:
             result["has_layers"] = True
-            for xref, ocg_info in ocgs.items():
-                layer = {
-                    "xref": xref,
-                    "name": ocg_info.get("name", f"Layer {xref}"),
-                    "on": ocg_info.get("on", True),
-                    "intent": ocg_info.get("intent", []),
-                    "usage": ocg_info.get("usage", "")
+            if columnar:
+                xrefs = list(ocgs)
+                infos = list(ocgs.values())
+                result["layers"] = {
+                    "xref": xrefs,
+                    "name": [info.get("name", f"Layer {xref}") for xref, info in zip(xrefs, infos)],
+                    "on": [info.get("on", True) for info in infos],
+                    "intent": [info.get("intent", []) for info in infos],
+                    "usage": [info.get("usage", "") for info in infos],
                 }
-                result["layers"].append(layer)
+            else:
+                for xref, ocg_info in ocgs.items():
+                    layer = {
+                        "xref": xref,
+                        "name": ocg_info.get("name", f"Layer {xref}"),
+                        "on": ocg_info.get("on", True),
+                        "intent": ocg_info.get("intent", []),
+                        "usage": ocg_info.get("usage", "")
+                    }
+                    result["layers"].append(layer)
 
         doc.close()
 
@@ -74,38 +248,20 @@ def set_layer_visibility(
     }
 
     try:
-        doc = fitz.open(input_path)
-        ocgs = doc.get_ocgs()
-
-        if not ocgs:
-            result["message"] = "No layers found in document"
-            doc.close()
-            return result
-
-        # Find the target layer
-        target_xref = None
-        if layer_xref is not None:
-            target_xref = layer_xref
-        elif layer_name:
-            for xref, info in ocgs.items():
-                if info.get("name") == layer_name:
-                    target_xref = xref
-                    break
-
-        if target_xref is None:
-            result["message"] = f"Layer not found: {layer_name or layer_xref}"
-            doc.close()
-            return result
+        with LayeredPdf(input_path) as pdf:
+            if not pdf.ocgs:
+                result["message"] = "No layers found in document"
+                return result
 
-        # Set layer visibility
-        doc.set_layer(target_xref, on=visible)
+            key = layer_xref if layer_xref is not None else layer_name
+            if not key or not pdf.toggle(key, visible):
+                result["message"] = f"Layer not found: {layer_name or layer_xref}"
+                return result
 
-        # Save
-        doc.save(output_path)
-        doc.close()
+            pdf.save(output_path)
 
         result["success"] = True
-        result["message"] = f"Layer '{layer_name or target_xref}' set to {'visible' if visible else 'hidden'}"
+        result["message"] = f"Layer '{layer_name or layer_xref}' set to {'visible' if visible else 'hidden'}"
 
     except Exception as e:
         result["message"] = f"Failed to set layer visibility: {str(e)}"
@@ -113,6 +269,47 @@ def set_layer_visibility(
     return result
 
 
+def set_layers_batch(
+    input_path: Path,
+    output_path: Path,
+    updates: dict
+) -> dict:
+    """
+    Apply several layer visibility changes with a single open and save.
+
+    `updates` maps a layer name or xref to the desired visibility.
+    """
+    result = {
+        "success": False,
+        "message": "",
+        "layers_affected": 0,
+        "not_found": []
+    }
+
+    try:
+        with LayeredPdf(input_path) as pdf:
+            if not pdf.ocgs:
+                result["message"] = "No layers found in document"
+                return result
+
+            result["not_found"] = [
+                key for key, visible in updates.items() if not pdf.toggle(key, visible)
+            ]
+            count = pdf.pending
+            pdf.save(output_path)
+
+        result["success"] = count > 0
+        result["layers_affected"] = count
+        result["message"] = f"Updated {count} layer(s)"
+        if result["not_found"]:
+            result["message"] += f", {len(result['not_found'])} not found"
+
+    except Exception as e:
+        result["message"] = f"Failed to set layers: {str(e)}"
+
+    return result
+
+
 def set_all_layers(
     input_path: Path,
     output_path: Path,
@@ -128,21 +325,14 @@ def set_all_layers(
     }
 
     try:
-        doc = fitz.open(input_path)
-        ocgs = doc.get_ocgs()
-
-        if not ocgs:
-            result["message"] = "No layers found in document"
-            doc.close()
-            return result
-
-        count = 0
-        for xref in ocgs.keys():
-            doc.set_layer(xref, on=visible)
-            count += 1
+        with LayeredPdf(input_path) as pdf:
+            if not pdf.ocgs:
+                result["message"] = "No layers found in document"
+                return result
 
-        doc.save(output_path)
-        doc.close()
+            pdf.set_all(visible)
+            count = pdf.pending
+            pdf.save(output_path)
 
         result["success"] = True
         result["layers_affected"] = count
@@ -154,6 +344,29 @@ def set_all_layers(
     return result
 
 
+_TRUE_STRINGS = frozenset({"true", "t", "yes", "y", "1", "on"})
+_FALSE_STRINGS = frozenset({"false", "f", "no", "n", "0", "off"})
+
+
+def _parse_bool(value: str) -> bool:
+    """argparse type for --visible: accepts true/false, yes/no, 1/0, on/off."""
+    lowered = value.lower()
+    if lowered in _TRUE_STRINGS:
+        return True
+    if lowered in _FALSE_STRINGS:
+        return False
+    raise argparse.ArgumentTypeError(f"boolean expected, got {value!r}")
+
+
+def _json_bool(value) -> bool:
+    """A batch visibility value: a JSON boolean or a string _parse_bool accepts."""
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, str):
+        return _parse_bool(value)
+    raise argparse.ArgumentTypeError(f"boolean expected, got {value!r}")
+
+
 def main():
     parser = argparse.ArgumentParser(description="PDF Layers operations")
     subparsers = parser.add_subparsers(dest="command", required=True)
@@ -162,6 +375,8 @@ def main():
     list_parser = subparsers.add_parser("list", help="List all layers")
     list_parser.add_argument("--input", "-i", required=True, help="Input PDF path")
     list_parser.add_argument("--json", action="store_true", help="Output as JSON")
+    list_parser.add_argument("--columnar", action="store_true",
+                             help="Return layers as parallel lists instead of one object per layer")
 
     # Toggle command
     toggle_parser = subparsers.add_parser("toggle", help="Toggle layer visibility")
@@ -169,7 +384,7 @@ def main():
     toggle_parser.add_argument("--output", "-o", required=True, help="Output PDF path")
     toggle_parser.add_argument("--layer", "-l", help="Layer name")
     toggle_parser.add_argument("--xref", type=int, help="Layer xref")
-    toggle_parser.add_argument("--visible", type=lambda x: x.lower() == 'true', default=True,
+    toggle_parser.add_argument("--visible", type=_parse_bool, default=True,
                                help="Set visibility (true/false)")
     toggle_parser.add_argument("--json", action="store_true", help="Output as JSON")
 
@@ -177,14 +392,22 @@ def main():
     all_parser = subparsers.add_parser("all", help="Set all layers visibility")
     all_parser.add_argument("--input", "-i", required=True, help="Input PDF path")
     all_parser.add_argument("--output", "-o", required=True, help="Output PDF path")
-    all_parser.add_argument("--visible", type=lambda x: x.lower() == 'true', required=True,
+    all_parser.add_argument("--visible", type=_parse_bool, required=True,
                             help="Set all to visible (true/false)")
     all_parser.add_argument("--json", action="store_true", help="Output as JSON")
 
+    # Batch update (JSON object on stdin: {"<name or xref>": true/false});
+    # keys are matched as layer names first, then as xrefs
+    batch_parser = subparsers.add_parser("batch", help="Set visibility of several layers at once")
+    batch_parser.add_argument("--input", "-i", required=True, help="Input PDF path")
+    batch_parser.add_argument("--output", "-o", required=True, help="Output PDF path")
+    batch_parser.add_argument("--json", action="store_true", help="Output as JSON")
+
     args = parser.parse_args()
 
     if args.command == "list":
-        result = get_layers(Path(args.input))
+        # The text listing reads columns; JSON keeps the row layout unless asked
+        result = get_layers(Path(args.input), columnar=args.columnar or not args.json)
 
         if hasattr(args, 'json') and args.json:
             print(json.dumps(result))
@@ -195,10 +418,11 @@ def main():
             if not result["has_layers"]:
                 print("No layers found")
             else:
-                print(f"Found {len(result['layers'])} layer(s):")
-                for layer in result["layers"]:
-                    status = "ON" if layer["on"] else "OFF"
-                    print(f"  [{status}] {layer['name']} (xref: {layer['xref']})")
+                layers = result["layers"]
+                print(f"Found {len(layers['xref'])} layer(s):")
+                for name, xref, on in zip(layers["name"], layers["xref"], layers["on"]):
+                    status = "ON" if on else "OFF"
+                    print(f"  [{status}] {name} (xref: {xref})")
 
     elif args.command == "toggle":
         if not args.layer and not args.xref:
@@ -232,6 +456,30 @@ def main():
             print(result["message"])
             sys.exit(0 if result["success"] else 1)
 
+    elif args.command == "batch":
+        try:
+            raw = json.load(sys.stdin)
+            if not isinstance(raw, dict):
+                raise ValueError("expected a JSON object of layer -> visibility")
+            updates = {key: _json_bool(visible) for key, visible in raw.items()}
+        except (ValueError, argparse.ArgumentTypeError) as e:
+            # JSONDecodeError is a ValueError
+            message = f"Invalid batch input on stdin: {e}"
+            if args.json:
+                print(json.dumps({"success": False, "message": message, "layers_affected": 0, "not_found": []}))
+            else:
+                print(f"Error: {message}")
+            sys.exit(1)
+
+        # String keys resolve as layer names first, then as xrefs
+        result = set_layers_batch(Path(args.input), Path(args.output), updates)
+
+        if hasattr(args, 'json') and args.json:
+            print(json.dumps(result))
+        else:
+            print(result["message"])
+            sys.exit(0 if result["success"] else 1)
+
 
 if __name__ == "__main__":
     main()
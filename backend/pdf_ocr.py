@@ -12,31 +12,132 @@ Provides OCR functionality for scanned PDFs:
 """
 
 import argparse
+import contextlib
+import copy
+import importlib
 import json
+import os
 import sys
 import re
+import shutil
 import subprocess
 import tempfile
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from importlib.util import find_spec
 from pathlib import Path
 from typing import List, Dict, Any, Optional
 from xml.etree import ElementTree
 
 try:
-    import ocrmypdf
-    from ocrmypdf import ExitCode
-    HAS_OCRMYPDF = True
+    from utils import file_cache_key, get_cache_dir, prune_cache_dir, write_cache_file
 except ImportError:
-    HAS_OCRMYPDF = False
+    from .utils import file_cache_key, get_cache_dir, prune_cache_dir, write_cache_file
+
+
+class _LazyModule:
+    """
+    Stand-in for a heavy module until a command first uses it.
+
+    OCRmyPDF and PyMuPDF dominate startup, and commands such as `check`
+    or `get-metrics` need one or neither. The first attribute access
+    imports the module and rebinds the global of the same name, so later
+    lookups go straight to the real module.
+    """
+
+    def __init__(self, name: str):
+        self._name = name
+
+    def __getattr__(self, attr):
+        module = importlib.import_module(self._name)
+        globals()[self._name] = module
+        return getattr(module, attr)
+
+
+# Availability is probed without importing; see _LazyModule
+HAS_OCRMYPDF = find_spec("ocrmypdf") is not None
+HAS_PYMUPDF = find_spec("fitz") is not None
+# Optional in-process Tesseract API for editable OCR
+HAS_TESSEROCR = find_spec("tesserocr") is not None
+
+ocrmypdf = _LazyModule("ocrmypdf")
+fitz = _LazyModule("fitz")  # PyMuPDF
+tesserocr = _LazyModule("tesserocr")
+
+try:
+    import orjson  # Faster serialization of the embedded OCR metrics
+except ImportError:
+    orjson = None
 
 try:
-    import fitz  # PyMuPDF
-    HAS_PYMUPDF = True
+    from lxml import etree as lxml_etree  # installed with pikepdf
+    HAS_LXML = True
 except ImportError:
-    HAS_PYMUPDF = False
+    HAS_LXML = False
+
+
+# Usual tessdata locations, checked when TESSDATA_PREFIX is not set
+_TESSDATA_DIRS = (
+    "/usr/share/tessdata",
+    "/usr/share/tesseract-ocr/5/tessdata",
+    "/usr/share/tesseract-ocr/4.00/tessdata",
+    "/usr/local/share/tessdata",
+    "/opt/homebrew/share/tessdata",
+)
+
+# Analysis results are tiny; this bounds the cache at thousands of files
+_ANALYZE_CACHE_MAX_BYTES = 4 * 1024 * 1024
+
+# JPEG quality for the page rasters behind editable-OCR text
+_BACKGROUND_JPEG_QUALITY = 85
+
+# Tesseract gains no accuracy past ~300 DPI; higher --dpi values only
+# sharpen the editable-OCR background
+_OCR_MAX_DPI = 300
+
+# Seconds to wait for `tesseract --version` / `--list-langs` before giving up
+_PROBE_TIMEOUT = 5
+
+
+def _list_tessdata_languages() -> Optional[List[str]]:
+    """
+    List installed Tesseract languages from the .traineddata files.
+
+    Returns None if no tessdata directory with languages is found, so the
+    caller can fall back to asking Tesseract itself.
+    """
+    prefix = os.environ.get("TESSDATA_PREFIX")
+    # Tesseract 4+ points TESSDATA_PREFIX at tessdata itself, 3.x at its parent
+    candidates = (prefix, os.path.join(prefix, "tessdata")) if prefix else _TESSDATA_DIRS
+
+    for directory in candidates:
+        try:
+            names = os.listdir(directory)
+        except OSError:
+            continue
+        langs = sorted(name[:-len(".traineddata")] for name in names if name.endswith(".traineddata"))
+        if langs:
+            return langs
+
+    return None
 
 
 def check_dependencies() -> dict:
-    """Check if OCRmyPDF and Tesseract are available."""
+    """
+    Check if OCRmyPDF and Tesseract are available.
+
+    The probe runs Tesseract twice, so its result is cached for the life of
+    the process; callers get a private copy they may modify. Call
+    check_dependencies.cache_clear() after installing languages.
+    """
+    return copy.deepcopy(_check_dependencies_cached())
+
+
+@lru_cache(maxsize=1)
+def _check_dependencies_cached() -> dict:
+    """Uncached implementation of check_dependencies."""
     result = {
         "ocrmypdf_installed": HAS_OCRMYPDF,
         "ocrmypdf_version": None,
@@ -50,33 +151,41 @@ def check_dependencies() -> dict:
             from ocrmypdf._exec import tesseract
             result["tesseract_installed"] = True
 
-            # Get available languages
-            try:
-                import subprocess
-                lang_output = subprocess.run(
-                    ["tesseract", "--list-langs"],
-                    capture_output=True,
-                    text=True
-                )
-                if lang_output.returncode == 0:
-                    # Skip first line (header) and get language codes
-                    langs = lang_output.stdout.strip().split('\n')[1:]
-                    result["available_languages"] = [l.strip() for l in langs if l.strip()]
-            except Exception:
-                pass
+            # Get available languages: read the tessdata directory, and only
+            # launch Tesseract when it cannot be found
+            langs = _list_tessdata_languages()
+            if langs is not None:
+                result["available_languages"] = langs
+            else:
+                try:
+                    lang_output = subprocess.run(
+                        ["tesseract", "--list-langs"],
+                        capture_output=True,
+                        timeout=_PROBE_TIMEOUT,
+                    )
+                    if lang_output.returncode == 0:
+                        # Skip first line (header) and get language codes;
+                        # the codes are ASCII, so decode line by line
+                        langs = lang_output.stdout.split(b"\n")[1:]
+                        result["available_languages"] = [
+                            l.strip().decode("ascii", "replace") for l in langs if l.strip()
+                        ]
+                except (subprocess.TimeoutExpired, OSError):
+                    pass
 
             # Get tesseract version
             try:
                 ver_output = subprocess.run(
                     ["tesseract", "--version"],
                     capture_output=True,
-                    text=True
+                    text=True,
+                    timeout=_PROBE_TIMEOUT,
                 )
                 if ver_output.returncode == 0:
                     # First line contains version
                     first_line = ver_output.stdout.split('\n')[0]
                     result["tesseract_version"] = first_line.replace("tesseract ", "")
-            except Exception:
+            except (subprocess.TimeoutExpired, OSError):
                 pass
 
         except Exception:
@@ -85,6 +194,114 @@ def check_dependencies() -> dict:
     return result
 
 
+check_dependencies.cache_clear = _check_dependencies_cached.cache_clear
+
+
+def _pages_needing_ocr(input_path: str) -> tuple:
+    """
+    Return (page_indices, text_page_count, page_count), the indices being
+    the 0-based numbers of scanned pages.
+
+    A page needs OCR when it has (almost) no text but shows a scan: image
+    XObjects or, for scans drawn as inline images or vector paths, enough
+    rendered ink (as in analyze_pdf). text_page_count counts the pages
+    with a real text layer.
+    """
+    doc = fitz.open(input_path)
+    try:
+        pages = []
+        text_pages = 0
+        for page in doc:
+            if len(page.get_text("text").strip()) > 50:
+                text_pages += 1
+            elif page.get_images(full=False) or _ink_ratio(page) >= _INK_RATIO_MIN:
+                pages.append(page.number)
+        return pages, text_pages, doc.page_count
+    finally:
+        doc.close()
+
+
+def _run_tesseract_overlay(
+    input_path: str,
+    output_path: str,
+    language: str,
+    pages: List[int],
+    dpi: int = 300,
+) -> Optional[dict]:
+    """
+    OCR the given pages with one Tesseract run and overlay the text.
+
+    The pages are rendered to grayscale PNGs and passed to Tesseract as a
+    file list, so the language model is loaded once. Tesseract's text-only
+    PDF is then laid over the original pages, which are left untouched.
+
+    Returns None when the pages can't take this path (rotated pages), so
+    the caller can fall back to ocrmypdf.
+    """
+    doc = fitz.open(input_path)
+    try:
+        if any(doc[pno].rotation for pno in pages):
+            return None
+
+        with tempfile.TemporaryDirectory(prefix="tlacuilo-ocr-") as tmp_dir:
+            image_paths = []
+            for pno in pages:
+                pix = doc[pno].get_pixmap(dpi=dpi, colorspace=fitz.csGRAY)
+                image_path = os.path.join(tmp_dir, f"page-{pno:05d}.png")
+                pix.save(image_path)
+                image_paths.append(image_path)
+
+            list_path = os.path.join(tmp_dir, "pages.txt")
+            with open(list_path, "w", encoding="utf-8") as f:
+                f.write("\n".join(image_paths) + "\n")
+
+            out_base = os.path.join(tmp_dir, "text")
+            proc = subprocess.run(
+                ["tesseract", list_path, out_base, "-l", language,
+                 "-c", "textonly_pdf=1", "pdf"],
+                capture_output=True,
+                text=True,
+                timeout=120 * len(pages),
+            )
+            if proc.returncode != 0:
+                return {
+                    "success": False,
+                    "exit_code": proc.returncode,
+                    "error": f"Tesseract failed: {proc.stderr.strip()}",
+                }
+
+            text_doc = fitz.open(out_base + ".pdf")
+            try:
+                for text_pno, pno in enumerate(pages):
+                    page = doc[pno]
+                    page.show_pdf_page(page.rect, text_doc, text_pno, overlay=True)
+            finally:
+                text_doc.close()
+
+        in_place = output_path != "-" and Path(output_path).exists() and Path(input_path).samefile(output_path)
+        if output_path == "-" or in_place:
+            data = doc.tobytes(garbage=1, deflate=True)
+        else:
+            data = None
+            doc.save(output_path, garbage=1, deflate=True)
+    finally:
+        doc.close()
+
+    if data is not None:
+        if output_path == "-":
+            sys.stdout.buffer.write(data)
+            sys.stdout.buffer.flush()
+        else:
+            Path(output_path).write_bytes(data)
+
+    return {
+        "success": True,
+        "output_path": output_path,
+        "exit_code": 0,
+        "pages_ocrd": len(pages),
+    }
+
+
 def run_ocr(
     input_path: str,
     output_path: str,
@@ -99,13 +316,15 @@ def run_ocr(
     pdf_renderer: str = "auto",
     optimize: int = 1,
     pdfa_image_compression: str = "auto",
+    jobs: Optional[int] = None,
+    fast_path: bool = False,
 ) -> dict:
     """
     Run OCR on a PDF file.
 
     Args:
-        input_path: Path to input PDF
-        output_path: Path to output PDF
+        input_path: Path to input PDF, or "-" to read it from stdin
+        output_path: Path to output PDF, or "-" to write it to stdout
         language: OCR language(s), e.g., "eng", "eng+spa"
         deskew: Deskew pages before OCR
         rotate_pages: Rotate pages to correct orientation
@@ -114,9 +333,15 @@ def run_ocr(
         skip_text: Skip pages that already have text
         force_ocr: Force OCR even if text is present
         redo_ocr: Redo OCR on pages that have text (removes existing text layer)
+            Unless force_ocr or redo_ocr is set, only image-only pages
+            are sent to Tesseract; the rest are copied through.
         pdf_renderer: PDF renderer (auto, hocr, sandwich, hocr-docker)
         optimize: Optimization level (0-3)
         pdfa_image_compression: Image compression for PDF/A (auto, jpeg, lossless)
+        jobs: Pages OCR'd in parallel (default: one per CPU core)
+        fast_path: With optimize=0 and no image preprocessing, run Tesseract
+            once over all pages and overlay its text layer directly,
+            skipping ocrmypdf's rasterize/PDF-A pipeline
 
     Returns:
         dict with success status and details
@@ -128,8 +353,7 @@ def run_ocr(
             "exit_code": -1,
         }
 
-    input_file = Path(input_path)
-    if not input_file.exists():
+    if input_path != "-" and not Path(input_path).exists():
         return {
             "success": False,
             "error": f"Input file not found: {input_path}",
@@ -149,18 +373,55 @@ def run_ocr(
             "redo_ocr": redo_ocr,
             "optimize": optimize,
             "progress_bar": False,
+            "jobs": jobs or os.cpu_count() or 1,
         }
 
+        # Pre-scan with PyMuPDF so Tesseract only sees pages without text.
+        # Only a file whose every page has a text layer is passed through;
+        # pages with neither text nor a visible scan are left to ocrmypdf.
+        if HAS_PYMUPDF and input_path != "-" and not (force_ocr or redo_ocr):
+            ocr_pages, text_pages, page_count = _pages_needing_ocr(input_path)
+            if text_pages == page_count:
+                if output_path == "-":
+                    with open(input_path, "rb") as src:
+                        shutil.copyfileobj(src, sys.stdout.buffer)
+                    sys.stdout.buffer.flush()
+                elif not Path(output_path).exists() or not Path(input_path).samefile(output_path):
+                    shutil.copyfile(input_path, output_path)
+                return {
+                    "success": True,
+                    "output_path": output_path,
+                    "exit_code": ocrmypdf.ExitCode.already_done_ocr.value,
+                    "message": "File already contains text layer",
+                }
+            if ocr_pages and len(ocr_pages) < page_count:
+                kwargs["pages"] = ",".join(str(pno + 1) for pno in ocr_pages)
+
+            preprocess = deskew or rotate_pages or remove_background or clean
+            if ocr_pages and fast_path and optimize == 0 and not preprocess:
+                fast_result = _run_tesseract_overlay(input_path, output_path, language, ocr_pages)
+                if fast_result is not None:
+                    return fast_result
+
+        # Pages already run in parallel processes; keep each Tesseract to one
+        # OpenMP thread so workers don't oversubscribe the cores
+        os.environ.setdefault("OMP_THREAD_LIMIT", "1")
+
+        # ocrmypdf takes binary streams directly, so "-" pipes the PDF
+        # through without staging a copy on disk
+        ocr_input = sys.stdin.buffer if input_path == "-" else input_path
+        ocr_output = sys.stdout.buffer if output_path == "-" else output_path
+
         # Run OCR
-        exit_code = ocrmypdf.ocr(input_path, output_path, **kwargs)
+        exit_code = ocrmypdf.ocr(ocr_input, ocr_output, **kwargs)
 
-        if exit_code == ExitCode.ok:
+        if exit_code == ocrmypdf.ExitCode.ok:
             return {
                 "success": True,
                 "output_path": output_path,
                 "exit_code": exit_code.value,
             }
-        elif exit_code == ExitCode.already_done_ocr:
+        elif exit_code == ocrmypdf.ExitCode.already_done_ocr:
             return {
                 "success": True,
                 "output_path": output_path,
@@ -182,7 +443,22 @@ def run_ocr(
         }
 
 
-def analyze_pdf(input_path: str) -> dict:
+# Gray levels below 128 count as ink; translate() maps them to 1, the rest to 0
+_INK_TABLE = bytes(1 if level < 128 else 0 for level in range(256))
+# Share of inked pixels above which a text-less page is treated as scanned
+_INK_RATIO_MIN = 0.01
+
+
+def _ink_ratio(page) -> float:
+    """Fraction of dark pixels in a small grayscale render of the page."""
+    pix = page.get_pixmap(matrix=fitz.Matrix(0.2, 0.2), colorspace=fitz.csGRAY, alpha=False)
+    samples = pix.samples
+    if not samples:
+        return 0.0
+    return samples.translate(_INK_TABLE).count(1) / len(samples)
+
+
+def analyze_pdf(input_path: str, use_cache: bool = True, force_refresh: bool = False) -> dict:
     """
     Analyze a PDF to determine if it needs OCR.
 
@@ -190,42 +466,81 @@ def analyze_pdf(input_path: str) -> dict:
     - Number of pages
     - Whether it contains text
     - Whether it appears to be scanned
+
+    Successful results are cached on disk (~/.cache/tlacuilo/analyze)
+    keyed by path, mtime and size, so re-analyzing an unchanged file costs
+    a stat and a small read. force_refresh recomputes and replaces the entry.
     """
+    cache_file = None
+    if use_cache:
+        try:
+            cache_file = get_cache_dir("analyze") / f"{file_cache_key(input_path)}.json"
+        except OSError:
+            pass  # Missing input or unwritable cache: analyze uncached
+
+    if cache_file is not None and not force_refresh:
+        try:
+            return json.loads(cache_file.read_bytes())
+        except (OSError, ValueError):
+            pass
+
+    result = _analyze_pdf_uncached(input_path)
+
+    if cache_file is not None and result["success"]:
+        try:
+            write_cache_file(cache_file, json.dumps(result))
+        except OSError:
+            return result  # Caching is best effort
+        prune_cache_dir(cache_file.parent, _ANALYZE_CACHE_MAX_BYTES)
+
+    return result
+
+
+def _analyze_pdf_uncached(input_path: str) -> dict:
+    """Uncached implementation of analyze_pdf."""
     if not HAS_OCRMYPDF:
         return {
             "success": False,
             "error": "OCRmyPDF is not installed",
         }
 
-    try:
-        from pdfminer.high_level import extract_text
-        from pikepdf import Pdf
-
-        with Pdf.open(input_path) as pdf:
-            page_count = len(pdf.pages)
-
-        # Try to extract text
-        text = extract_text(input_path, maxpages=3)  # Sample first 3 pages
-        has_text = len(text.strip()) > 50  # More than 50 chars suggests real text
+    if not HAS_PYMUPDF:
+        return {
+            "success": False,
+            "error": "PyMuPDF is required",
+        }
 
-        # Check if pages contain images (potential scanned document)
-        with Pdf.open(input_path) as pdf:
+    try:
+        # One open and one loop over the first 3 pages gives the page count,
+        # the text sample and the image check
+        doc = fitz.open(input_path)
+        try:
+            page_count = doc.page_count
+            sample_stop = min(3, page_count)
+            text_parts = []
             has_images = False
-            for page in list(pdf.pages)[:3]:  # Sample first 3 pages
-                resources = page.get("/Resources", {})
-                if "/XObject" in resources:
-                    xobjects = resources.get("/XObject", {})
-                    # pikepdf dictionaries don't have .values(), iterate via keys
-                    for key in xobjects.keys():
-                        obj = xobjects[key]
-                        if obj.get("/Subtype") == "/Image":
-                            has_images = True
-                            break
-                if has_images:
-                    break
+            for page in doc.pages(stop=sample_stop):
+                text_parts.append(page.get_text("text"))
+                # Check if pages contain images (potential scanned document)
+                if not has_images and page.get_images(full=False):
+                    has_images = True
+
+            text = "".join(text_parts)
+            has_text = len(text.strip()) > 50  # More than 50 chars suggests real text
+
+            # No text and no image XObjects: the scan may still be drawn as
+            # inline images or vector paths, so look at the rendered ink
+            has_ink = False
+            if not has_text and not has_images:
+                has_ink = any(
+                    _ink_ratio(page) >= _INK_RATIO_MIN
+                    for page in doc.pages(stop=sample_stop)
+                )
+        finally:
+            doc.close()
 
         # Determine if OCR is needed
-        needs_ocr = has_images and not has_text
+        needs_ocr = (has_images or has_ink) and not has_text
 
         return {
             "success": True,
@@ -247,9 +562,16 @@ def analyze_pdf(input_path: str) -> dict:
 # Editable OCR Mode - Creates real text objects with visual metrics
 # =============================================================================
 
+# hOCR title properties, e.g. "bbox 10 20 110 40; x_wconf 93"
+_BBOX_RE = re.compile(r'bbox\s+(\d+)\s+(\d+)\s+(\d+)\s+(\d+)')
+_WCONF_RE = re.compile(r'x_wconf\s+(\d+)')
+# Word titles carry both, bbox first: read them in one scan
+_WORD_TITLE_RE = re.compile(r'bbox\s+(\d+)\s+(\d+)\s+(\d+)\s+(\d+)(?:;.*?x_wconf\s+(\d+))?')
+
+
 def parse_hocr_bbox(title: str) -> Optional[tuple]:
     """Extract bbox coordinates from hOCR title attribute."""
-    match = re.search(r'bbox\s+(\d+)\s+(\d+)\s+(\d+)\s+(\d+)', title)
+    match = _BBOX_RE.search(title)
     if match:
         return tuple(map(int, match.groups()))
     return None
@@ -257,12 +579,82 @@ def parse_hocr_bbox(title: str) -> Optional[tuple]:
 
 def parse_hocr_confidence(title: str) -> int:
     """Extract confidence (x_wconf) from hOCR title attribute."""
-    match = re.search(r'x_wconf\s+(\d+)', title)
+    match = _WCONF_RE.search(title)
     if match:
         return int(match.group(1))
     return 0
 
 
+if HAS_LXML:
+    # Compiled once; each call filters by class in C instead of walking
+    # every descendant in Python
+    _HOCR_AREAS = lxml_etree.XPath("//*[@class='ocr_carea' or @class='ocr_par']")
+    _HOCR_LINES = lxml_etree.XPath(".//*[@class='ocr_line']")
+    _HOCR_WORDS = lxml_etree.XPath(".//*[@class='ocrx_word']")
+
+
+def _hocr_elements(hocr_content: str) -> tuple:
+    """
+    Parse hOCR and return (areas, find_lines, find_words).
+
+    areas are the ocr_carea/ocr_par elements in document order;
+    find_lines(area) and find_words(line) select descendants by class.
+    Uses lxml's compiled XPath when available, ElementTree otherwise.
+    """
+    if HAS_LXML:
+        # bytes, since lxml rejects str input that has an encoding declaration
+        root = lxml_etree.fromstring(hocr_content.encode("utf-8"))
+        return _HOCR_AREAS(root), _HOCR_LINES, _HOCR_WORDS
+
+    root = ElementTree.fromstring(hocr_content)
+    areas = [elem for elem in root.iter() if elem.get('class') in ('ocr_carea', 'ocr_par')]
+    return (
+        areas,
+        lambda area: area.iterfind(".//*[@class='ocr_line']"),
+        lambda line: line.iterfind(".//*[@class='ocrx_word']"),
+    )
+
+
+def _parse_hocr_line(line_elem, find_words) -> Optional[Dict[str, Any]]:
+    """Parse one ocr_line element; None if it has no bbox or no words."""
+    line_bbox = parse_hocr_bbox(line_elem.get('title', ''))
+
+    if not line_bbox:
+        return None
+
+    line = {
+        'bbox': line_bbox,
+        'words': [],
+        'text': '',
+    }
+
+    word_texts = []
+
+    # Find words within this line
+    for word_elem in find_words(line_elem):
+        match = _WORD_TITLE_RE.search(word_elem.get('title', ''))
+        # Most words are a bare text node; only nested markup (<strong>,
+        # <em>) needs the itertext() walk.
+        if len(word_elem) == 0:
+            word_text = (word_elem.text or '').strip()
+        else:
+            word_text = ''.join(word_elem.itertext()).strip()
+
+        if match and word_text:
+            line['words'].append({
+                'bbox': (int(match[1]), int(match[2]), int(match[3]), int(match[4])),
+                'text': word_text,
+                'confidence': int(match[5]) if match[5] else 0,
+            })
+            word_texts.append(word_text)
+
+    if not word_texts:
+        return None
+
+    line['text'] = ' '.join(word_texts)
+    return line
+
+
 def parse_hocr(hocr_content: str) -> List[Dict[str, Any]]:
     """
     Parse hOCR output from Tesseract.
@@ -276,63 +668,48 @@ def parse_hocr(hocr_content: str) -> List[Dict[str, Any]]:
     blocks = []
 
     try:
-        # Parse as HTML/XML
-        root = ElementTree.fromstring(hocr_content)
+        # Parse as XML and find all ocr_carea (content areas) or
+        # ocr_par (paragraphs)
+        areas, find_lines, find_words = _hocr_elements(hocr_content)
+
+        # An ocr_par sits inside its ocr_carea, so every line is reached
+        # from both; parse each line element (and its words) only once.
+        # Holding the element as a key also keeps lxml's proxy alive, so
+        # the second visit gets the same object back.
+        parsed_lines = {}
+
+        for area in areas:
+            title = area.get('title', '')
+            area_bbox = parse_hocr_bbox(title)
+
+            if not area_bbox:
+                continue
+
+            block = {
+                'bbox': area_bbox,
+                'lines': [],
+                'text': '',
+            }
 
-        # Find all ocr_carea (content areas) or ocr_par (paragraphs)
-        for area in root.iter():
-            if area.get('class') in ('ocr_carea', 'ocr_par'):
-                title = area.get('title', '')
-                area_bbox = parse_hocr_bbox(title)
+            line_texts = []
 
-                if not area_bbox:
-                    continue
+            # Find lines within this area
+            for line_elem in find_lines(area):
+                if line_elem in parsed_lines:
+                    line = parsed_lines[line_elem]
+                else:
+                    line = parsed_lines[line_elem] = _parse_hocr_line(line_elem, find_words)
 
-                block = {
-                    'bbox': area_bbox,
-                    'lines': [],
-                    'text': '',
-                }
+                if line is not None:
+                    block['lines'].append(line)
+                    line_texts.append(line['text'])
 
-                # Find lines within this area
-                for line_elem in area.iter():
-                    if line_elem.get('class') == 'ocr_line':
-                        line_title = line_elem.get('title', '')
-                        line_bbox = parse_hocr_bbox(line_title)
-
-                        if not line_bbox:
-                            continue
-
-                        line = {
-                            'bbox': line_bbox,
-                            'words': [],
-                            'text': '',
-                        }
-
-                        # Find words within this line
-                        for word_elem in line_elem.iter():
-                            if word_elem.get('class') == 'ocrx_word':
-                                word_title = word_elem.get('title', '')
-                                word_bbox = parse_hocr_bbox(word_title)
-                                word_conf = parse_hocr_confidence(word_title)
-                                word_text = ''.join(word_elem.itertext()).strip()
-
-                                if word_bbox and word_text:
-                                    line['words'].append({
-                                        'bbox': word_bbox,
-                                        'text': word_text,
-                                        'confidence': word_conf,
-                                    })
-
-                        if line['words']:
-                            line['text'] = ' '.join(w['text'] for w in line['words'])
-                            block['lines'].append(line)
-
-                if block['lines']:
-                    block['text'] = '\n'.join(l['text'] for l in block['lines'])
-                    blocks.append(block)
-
-    except ElementTree.ParseError as e:
+            if line_texts:
+                block['text'] = '\n'.join(line_texts)
+                blocks.append(block)
+
+    except SyntaxError as e:
+        # Base of both ElementTree.ParseError and lxml's XMLSyntaxError
         print(f"[WARN] hOCR parse error: {e}", file=sys.stderr)
 
     return blocks
@@ -370,10 +747,17 @@ def get_image_regions(page, zoom: float) -> list:
     page_rect = page.rect
     page_area = page_rect.width * page_rect.height
 
-    # Get embedded images on the page (photos, logos, etc.)
-    for img in page.get_images(full=True):
+    # Get embedded images on the page (photos, logos, etc.). An image used
+    # from several Form XObjects is listed once per referencer, but
+    # get_image_rects already returns all of its placements: visit each
+    # xref once.
+    seen_xrefs = set()
+    for img in page.get_images(full=False):
+        xref = img[0]
+        if xref in seen_xrefs:
+            continue
+        seen_xrefs.add(xref)
         try:
-            xref = img[0]
             img_rects = page.get_image_rects(xref)
             for rect in img_rects:
                 # Skip if the image covers most of the page (it's the background)
@@ -397,6 +781,9 @@ def get_image_regions(page, zoom: float) -> list:
     return image_rects
 
 
+_GARBAGE_DELETE = str.maketrans('', '', '\\|}{[]@#$%^&*<>~`')
+
+
 def is_garbage_text(text: str) -> bool:
     """
     Check if OCR text is clearly garbage (very high ratio of special chars).
@@ -411,9 +798,9 @@ def is_garbage_text(text: str) -> bool:
     if len(text_clean) == 1 and not text_clean.isalnum():
         return True
 
-    # Count truly garbage characters (not normal punctuation)
-    garbage_chars = set('\\|}{[]@#$%^&*<>~`')
-    garbage_count = sum(1 for c in text_clean if c in garbage_chars)
+    # Count truly garbage characters (not normal punctuation): translate()
+    # deletes them in one C-level pass, the length difference is the count
+    garbage_count = len(text_clean) - len(text_clean.translate(_GARBAGE_DELETE))
 
     # Only skip if MORE THAN 50% garbage (very lenient)
     if len(text_clean) > 0 and garbage_count / len(text_clean) > 0.5:
@@ -427,16 +814,24 @@ def rect_overlaps_any(rect, rect_list, threshold=0.7) -> bool:
     Check if a rectangle SIGNIFICANTLY overlaps with any rect in the list.
     threshold=0.7 means 70% of the rect must be inside an image to be skipped.
     """
+    rect_area = rect.width * rect.height
+    if rect_area <= 0 or not rect_list:
+        return False
+
+    # Intersect on plain coordinates: disjoint regions (the common case)
+    # are rejected by two comparisons without building a fitz.Rect
+    x0, y0, x1, y1 = rect.x0, rect.y0, rect.x1, rect.y1
     for other in rect_list:
-        intersection = rect & other
-        if intersection.is_empty:
+        ix0 = max(x0, other.x0)
+        ix1 = min(x1, other.x1)
+        if ix1 <= ix0:
             continue
-
-        rect_area = rect.width * rect.height
-        if rect_area > 0:
-            overlap_ratio = (intersection.width * intersection.height) / rect_area
-            if overlap_ratio > threshold:
-                return True
+        iy0 = max(y0, other.y0)
+        iy1 = min(y1, other.y1)
+        if iy1 <= iy0:
+            continue
+        if (ix1 - ix0) * (iy1 - iy0) / rect_area > threshold:
+            return True
 
     return False
 
@@ -458,13 +853,15 @@ def is_all_caps(text: str) -> bool:
     return upper_count / len(letters) >= 0.9
 
 
+_DESCENDER_CHARS = frozenset('gjpqy')
+
+
 def has_descenders(text: str) -> bool:
     """
     Check if text contains characters with descenders (g, j, p, q, y).
     Text without descenders has shorter bounding boxes.
     """
-    descender_chars = set('gjpqy')
-    return any(c.lower() in descender_chars for c in text)
+    return not _DESCENDER_CHARS.isdisjoint(text.lower())
 
 
 def calculate_baseline_font_size(blocks: list, zoom: float) -> float:
@@ -472,36 +869,262 @@ def calculate_baseline_font_size(blocks: list, zoom: float) -> float:
     Calculate a reference font size from all text blocks.
     Uses the median of line heights from multi-line blocks (body text).
     """
-    line_heights = []
+    # One pass collects both candidate sets: lines from multi-line blocks
+    # (more likely body text) and, as a fallback, all lines
+    body_heights = []
+    all_heights = []
 
     for block in blocks:
-        # Focus on blocks with multiple lines (more likely body text)
-        if len(block.get('lines', [])) >= 2:
-            for line in block['lines']:
-                bbox = line.get('bbox')
-                if bbox:
-                    height_pt = (bbox[3] - bbox[1]) / zoom
-                    if 8 < height_pt < 30:  # Reasonable text range
-                        line_heights.append(height_pt)
-
-    if not line_heights:
-        # Fallback: use all lines
-        for block in blocks:
-            for line in block.get('lines', []):
-                bbox = line.get('bbox')
-                if bbox:
-                    height_pt = (bbox[3] - bbox[1]) / zoom
-                    if 8 < height_pt < 30:
-                        line_heights.append(height_pt)
-
+        lines = block.get('lines', [])
+        is_body = len(lines) >= 2
+        for line in lines:
+            bbox = line.get('bbox')
+            if bbox:
+                height_pt = (bbox[3] - bbox[1]) / zoom
+                if 8 < height_pt < 30:  # Reasonable text range
+                    all_heights.append(height_pt)
+                    if is_body:
+                        body_heights.append(height_pt)
+
+    line_heights = body_heights or all_heights
     if line_heights:
-        sorted_heights = sorted(line_heights)
-        median = sorted_heights[len(sorted_heights) // 2]
+        line_heights.sort()
+        median = line_heights[len(line_heights) // 2]
         return median * 0.85  # Convert to font size
 
     return 11.0  # Default fallback
 
 
+def _run_tesseract_hocr(image_bytes: bytes, language: str, env: dict) -> str:
+    """
+    Run Tesseract on an in-memory image (fed through stdin) with hOCR output.
+
+    Raises RuntimeError with Tesseract's stderr if it fails.
+    """
+    result = subprocess.run(
+        ['tesseract', 'stdin', 'stdout', '-l', language, 'hocr'],
+        input=image_bytes,
+        capture_output=True,
+        timeout=120,
+        env=env,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.decode("utf-8", "replace"))
+    return result.stdout.decode("utf-8")
+
+
+class _TesserocrHocr:
+    """
+    hOCR from tesserocr's in-process API, one PyTessBaseAPI per thread.
+
+    Every `tesseract` run reloads the language models; an API instance
+    keeps them loaded for the whole document. Instances are not
+    thread-safe, so each pool worker creates its own on first use.
+    """
+
+    def __init__(self, language: str, dpi: int):
+        self._language = language
+        self._dpi = dpi
+        self._local = threading.local()
+        self._apis = []
+
+    def __enter__(self) -> "_TesserocrHocr":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    @staticmethod
+    def supports(language: str) -> bool:
+        """True if tesserocr is installed and has every language in `language`."""
+        if not HAS_TESSEROCR:
+            return False
+        try:
+            _, available = tesserocr.get_languages()
+        except Exception:
+            return False
+        return all(lang in available for lang in language.split('+'))
+
+    def __call__(self, samples: bytes, width: int, height: int, n: int, stride: int) -> str:
+        """hOCR for a raw pixmap (samples as from fitz.Pixmap)."""
+        api = getattr(self._local, 'api', None)
+        if api is None:
+            api = self._local.api = tesserocr.PyTessBaseAPI(lang=self._language)
+            self._apis.append(api)
+        api.SetImageBytes(samples, width, height, n, stride)
+        api.SetSourceResolution(self._dpi)
+        hocr = api.GetHOCRText(0)
+        if not hocr:
+            raise RuntimeError("tesserocr returned no hOCR")
+        return hocr
+
+    def close(self):
+        """Release the APIs of all workers."""
+        for api in self._apis:
+            api.End()
+        self._apis.clear()
+
+
+def _apply_hocr_page(
+    new_page,
+    page_num: int,
+    page_rect,
+    image_regions: list,
+    hocr_content: str,
+    zoom: float,
+    pymupdf_font: str,
+    preserve_images: bool,
+) -> dict:
+    """
+    Draw the OCR text of one page onto new_page.
+
+    Whites out each kept block and inserts its lines as real text.
+    Returns the page metrics.
+    """
+    blocks = parse_hocr(hocr_content)
+
+    print(f"[INFO]   Found {len(blocks)} text blocks from OCR", file=sys.stderr)
+
+    # Calculate baseline font size for this page
+    baseline_font_size = calculate_baseline_font_size(blocks, zoom)
+    print(f"[INFO]   Baseline font size: {baseline_font_size:.1f}pt", file=sys.stderr)
+
+    # Page metrics
+    page_metrics = {
+        "page": page_num,
+        "width": page_rect.width,
+        "height": page_rect.height,
+        "blocks": [],
+        "skipped_blocks": 0,
+    }
+
+    blocks_processed = 0
+    blocks_skipped = 0
+
+    # Every whiteout rect is drawn into one Shape and committed as a single
+    # filled path; the lines are queued and inserted on top afterwards.
+    # insert_text keeps the unembedded base-14 font (a TextWriter would
+    # embed a full font file in every document).
+    whiteout = new_page.new_shape()
+    text_lines = []
+
+    for block in blocks:
+        # Convert pixel bbox to PDF points
+        px_bbox = block['bbox']
+        pdf_bbox = fitz.Rect(
+            px_bbox[0] / zoom,
+            px_bbox[1] / zoom,
+            px_bbox[2] / zoom,
+            px_bbox[3] / zoom,
+        )
+
+        # Skip blocks that overlap with images
+        if preserve_images and rect_overlaps_any(pdf_bbox, image_regions):
+            print(f"[INFO]   Skipping block overlapping image: '{block['text'][:30]}...'", file=sys.stderr)
+            blocks_skipped += 1
+            continue
+
+        # Skip garbage text
+        if is_garbage_text(block['text']):
+            print(f"[INFO]   Skipping garbage text: '{block['text'][:30]}...'", file=sys.stderr)
+            blocks_skipped += 1
+            continue
+
+        # Skip very small blocks (likely noise)
+        if pdf_bbox.width < 10 or pdf_bbox.height < 5:
+            blocks_skipped += 1
+            continue
+
+        # Calculate appropriate whitening rect
+        white_rect = pdf_bbox + (-1, -1, 1, 1)
+
+        # White out the original text area
+        whiteout.draw_rect(white_rect)
+
+        # Process each line with its own positioning
+        for line in block['lines']:
+            # Only x0, y0 and the height are needed, so skip building a
+            # fitz.Rect per line
+            line_px_x0, line_px_y0, _, line_px_y1 = line['bbox']
+            line_x0 = line_px_x0 / zoom
+            line_y0 = line_px_y0 / zoom
+            line_y1 = line_px_y1 / zoom
+
+            line_text = line['text']
+
+            # ALL CAPS or descender-free text has a shorter bbox; both the
+            # size and the baseline correction depend on it
+            short_bbox = is_all_caps(line_text) or not has_descenders(line_text)
+
+            # Calculate font size from line height
+            line_height_px = line_px_y1 - line_px_y0
+            line_height_pt = line_height_px / zoom
+            font_size = line_height_pt * 0.85  # Base: 85% of line height
+
+            # ALL CAPS correction: text without descenders has shorter bbox
+            # Apply scaling factor to compensate (descenders add ~20% to line height)
+            if short_bbox:
+                # Scale up by ~18% to match text with descenders
+                font_size = font_size * 1.18
+
+            # Ensure font size is at least the baseline (body text size)
+            # This prevents subtitles from being smaller than body text
+            if font_size < baseline_font_size * 0.95:
+                # If calculated size is smaller than baseline, use baseline
+                # (subtitles should never be smaller than body text)
+                font_size = max(font_size, baseline_font_size)
+
+            # Clamp font size to reasonable range
+            font_size = max(6, min(72, font_size))
+
+            # Position text at baseline
+            # For ALL CAPS (no descenders), baseline is higher (~85%)
+            # For normal text with descenders, baseline is lower (~80%)
+            if short_bbox:
+                baseline_ratio = 0.85
+            else:
+                baseline_ratio = 0.80
+
+            text_x = line_x0
+            text_y = line_y0 + ((line_y1 - line_y0) * baseline_ratio)
+
+            text_lines.append((fitz.Point(text_x, text_y), line_text, font_size))
+
+        blocks_processed += 1
+
+        # Store block metrics
+        page_metrics['blocks'].append({
+            # Hundredths of a point are plenty and keep the metadata short
+            'bbox_pdf': [round(pdf_bbox.x0, 2), round(pdf_bbox.y0, 2),
+                         round(pdf_bbox.x1, 2), round(pdf_bbox.y1, 2)],
+            'text': block['text'],
+            'line_count': len(block['lines']),
+        })
+
+    # Commit the whiteouts first so the text lands on top of them
+    if blocks_processed:
+        whiteout.finish(color=None, fill=(1, 1, 1))
+        whiteout.commit()
+
+    for point, line_text, font_size in text_lines:
+        try:
+            new_page.insert_text(
+                point,
+                line_text,
+                fontname=pymupdf_font,
+                fontsize=font_size,
+                color=(0, 0, 0),
+            )
+        except Exception as e:
+            print(f"[WARN] Failed to insert text '{line_text[:20]}...': {e}", file=sys.stderr)
+
+    page_metrics['skipped_blocks'] = blocks_skipped
+
+    print(f"[INFO]   Processed {blocks_processed} blocks, skipped {blocks_skipped}", file=sys.stderr)
+
+    return page_metrics
+
+
 def run_editable_ocr(
     input_path: str,
     output_path: str,
@@ -510,6 +1133,7 @@ def run_editable_ocr(
     font_family: str = "auto",
     preserve_images: bool = True,
     embed_metrics: bool = True,
+    jobs: Optional[int] = None,
 ) -> dict:
     """
     Run OCR and create editable text objects.
@@ -528,6 +1152,7 @@ def run_editable_ocr(
         font_family: Font to use ("auto", "times", "helvetica", "courier")
         preserve_images: Keep images/logos (True) or convert everything (False)
         embed_metrics: Embed visual metrics in PDF metadata
+        jobs: Tesseract processes run in parallel (default: one per CPU core)
 
     Returns:
         dict with success status, metrics, and output path
@@ -577,186 +1202,108 @@ def run_editable_ocr(
 
         print(f"[INFO] Starting editable OCR v2: {len(doc)} pages, DPI={dpi}, lang={language}", file=sys.stderr)
 
-        for page_num in range(len(doc)):
-            page = doc[page_num]
-            page_rect = page.rect
-            zoom = dpi / 72.0
+        zoom = dpi / 72.0
+        # hOCR coordinates are in the Tesseract raster's pixels, so they are
+        # converted back with ocr_zoom
+        ocr_dpi = min(dpi, _OCR_MAX_DPI)
+        ocr_zoom = ocr_dpi / 72.0
+        tesseract_env = {**os.environ, "OMP_THREAD_LIMIT": "1"}
+        workers = jobs or os.cpu_count() or 1
+
+        # tesserocr when it can handle the language, the tesseract CLI
+        # otherwise. Its workers get the same one-thread OpenMP limit as the
+        # CLI; libgomp reads it when tesserocr is first imported.
+        if HAS_TESSEROCR:
+            os.environ.setdefault("OMP_THREAD_LIMIT", "1")
+        if _TesserocrHocr.supports(language):
+            tesserocr_hocr = _TesserocrHocr(language, ocr_dpi)
+            print("[INFO] Using tesserocr", file=sys.stderr)
+        else:
+            tesserocr_hocr = None
 
+        def apply_next_result():
+            page_num, page_rect, image_regions, new_page, future = pending.popleft()
             print(f"[INFO] Processing page {page_num + 1}/{len(doc)}...", file=sys.stderr)
 
-            # Detect image/graphic regions to preserve
-            image_regions = get_image_regions(page, zoom) if preserve_images else []
-            print(f"[INFO]   Found {len(image_regions)} image/graphic regions to preserve", file=sys.stderr)
-
-            # Render page to image for OCR (high DPI for accuracy)
-            mat = fitz.Matrix(zoom, zoom)
-            pix = page.get_pixmap(matrix=mat)
-
-            # Create new page with same dimensions
-            new_page = out_doc.new_page(width=page_rect.width, height=page_rect.height)
-
-            # Insert the RENDERED IMAGE as background (not show_pdf_page!)
-            # This ensures no text duplication from original PDF text layers
-            # We use the same pixmap we'll send to Tesseract
-            img_rect = fitz.Rect(0, 0, page_rect.width, page_rect.height)
-            new_page.insert_image(img_rect, pixmap=pix)
-
-            # Save to temp file for Tesseract
-            with tempfile.NamedTemporaryFile(suffix='.png', delete=False) as tmp:
-                pix.save(tmp.name)
-                tmp_path = tmp.name
-
             try:
-                # Run Tesseract with hOCR output
-                result = subprocess.run(
-                    ['tesseract', tmp_path, 'stdout', '-l', language, 'hocr'],
-                    capture_output=True,
-                    text=True,
-                    timeout=120,
-                )
-
-                if result.returncode != 0:
-                    print(f"[WARN] Tesseract failed on page {page_num + 1}: {result.stderr}", file=sys.stderr)
-                    continue
-
-                hocr_content = result.stdout
-                blocks = parse_hocr(hocr_content)
-
-                print(f"[INFO]   Found {len(blocks)} text blocks from OCR", file=sys.stderr)
-
-                # Calculate baseline font size for this page
-                baseline_font_size = calculate_baseline_font_size(blocks, zoom)
-                print(f"[INFO]   Baseline font size: {baseline_font_size:.1f}pt", file=sys.stderr)
-
-                # Page metrics
-                page_metrics = {
-                    "page": page_num,
-                    "width": page_rect.width,
-                    "height": page_rect.height,
-                    "blocks": [],
-                    "skipped_blocks": 0,
-                }
-
-                blocks_processed = 0
-                blocks_skipped = 0
-
-                for block in blocks:
-                    # Convert pixel bbox to PDF points
-                    px_bbox = block['bbox']
-                    pdf_bbox = fitz.Rect(
-                        px_bbox[0] / zoom,
-                        px_bbox[1] / zoom,
-                        px_bbox[2] / zoom,
-                        px_bbox[3] / zoom,
+                hocr_content = future.result()
+            except RuntimeError as e:
+                print(f"[WARN] Tesseract failed on page {page_num + 1}: {e}", file=sys.stderr)
+                return
+
+            all_metrics['pages'].append(_apply_hocr_page(
+                new_page, page_num, page_rect, image_regions,
+                hocr_content, ocr_zoom, pymupdf_font, preserve_images,
+            ))
+
+        # Pages are rendered here (PyMuPDF is not thread-safe) and handed to
+        # a pool that runs one single-threaded Tesseract per core; results
+        # are applied in page order. Each queued page holds its raw image,
+        # so only a couple of pages per worker are kept in flight. The pool
+        # exits first, so the tesserocr APIs are released once no worker
+        # can use them, also on error.
+        apis = tesserocr_hocr if tesserocr_hocr is not None else contextlib.nullcontext()
+        with apis, ThreadPoolExecutor(max_workers=workers) as executor:
+            pending = deque()
+
+            for page_num in range(len(doc)):
+                page = doc[page_num]
+                page_rect = page.rect
+
+                print(f"[INFO] Rendering page {page_num + 1}/{len(doc)}...", file=sys.stderr)
+
+                # Detect image/graphic regions to preserve
+                image_regions = get_image_regions(page, zoom) if preserve_images else []
+                print(f"[INFO]   Found {len(image_regions)} image/graphic regions to preserve", file=sys.stderr)
+
+                # Render page at the requested DPI for the background
+                mat = fitz.Matrix(zoom, zoom)
+                pix = page.get_pixmap(matrix=mat)
+
+                # Create new page with same dimensions
+                new_page = out_doc.new_page(width=page_rect.width, height=page_rect.height)
+
+                # Insert the RENDERED IMAGE as background (not show_pdf_page!)
+                # This ensures no text duplication from original PDF text layers
+                # Up to _OCR_MAX_DPI the same pixmap goes to Tesseract. It goes in
+                # as JPEG: a lossless 300 DPI raster dominates both file size
+                # and the zlib time of the final save.
+                img_rect = fitz.Rect(0, 0, page_rect.width, page_rect.height)
+                new_page.insert_image(img_rect, stream=pix.tobytes("jpeg", jpg_quality=_BACKGROUND_JPEG_QUALITY))
+
+                # Tesseract binarizes from grayscale anyway, so send a
+                # third of the RGB bytes.
+                if ocr_zoom < zoom:
+                    gray = page.get_pixmap(matrix=fitz.Matrix(ocr_zoom, ocr_zoom), colorspace=fitz.csGRAY)
+                else:
+                    gray = fitz.Pixmap(fitz.csGRAY, pix)
+                if tesserocr_hocr is not None:
+                    future = executor.submit(
+                        tesserocr_hocr, gray.samples, gray.width, gray.height, gray.n, gray.stride,
                     )
+                else:
+                    # Uncompressed PNM through stdin: no PNG encode, temp
+                    # file or decode on Tesseract's side
+                    future = executor.submit(_run_tesseract_hocr, gray.tobytes("pnm"), language, tesseract_env)
+                pix = gray = None
+                pending.append((page_num, page_rect, image_regions, new_page, future))
 
-                    # Skip blocks that overlap with images
-                    if preserve_images and rect_overlaps_any(pdf_bbox, image_regions):
-                        print(f"[INFO]   Skipping block overlapping image: '{block['text'][:30]}...'", file=sys.stderr)
-                        blocks_skipped += 1
-                        continue
-
-                    # Skip garbage text
-                    if is_garbage_text(block['text']):
-                        print(f"[INFO]   Skipping garbage text: '{block['text'][:30]}...'", file=sys.stderr)
-                        blocks_skipped += 1
-                        continue
-
-                    # Skip very small blocks (likely noise)
-                    if pdf_bbox.width < 10 or pdf_bbox.height < 5:
-                        blocks_skipped += 1
-                        continue
-
-                    # Calculate appropriate whitening rect
-                    white_rect = pdf_bbox + (-1, -1, 1, 1)
-
-                    # White out the original text area
-                    shape = new_page.new_shape()
-                    shape.draw_rect(white_rect)
-                    shape.finish(color=None, fill=(1, 1, 1))
-                    shape.commit()
-
-                    # Process each line with its own positioning
-                    for line in block['lines']:
-                        line_px_bbox = line['bbox']
-                        line_pdf_bbox = fitz.Rect(
-                            line_px_bbox[0] / zoom,
-                            line_px_bbox[1] / zoom,
-                            line_px_bbox[2] / zoom,
-                            line_px_bbox[3] / zoom,
-                        )
-
-                        line_text = line['text']
-
-                        # Calculate font size from line height
-                        line_height_px = line_px_bbox[3] - line_px_bbox[1]
-                        line_height_pt = line_height_px / zoom
-                        font_size = line_height_pt * 0.85  # Base: 85% of line height
-
-                        # ALL CAPS correction: text without descenders has shorter bbox
-                        # Apply scaling factor to compensate (descenders add ~20% to line height)
-                        if is_all_caps(line_text) or not has_descenders(line_text):
-                            # Scale up by ~18% to match text with descenders
-                            font_size = font_size * 1.18
-
-                        # Ensure font size is at least the baseline (body text size)
-                        # This prevents subtitles from being smaller than body text
-                        if font_size < baseline_font_size * 0.95:
-                            # If calculated size is smaller than baseline, use baseline
-                            # (subtitles should never be smaller than body text)
-                            font_size = max(font_size, baseline_font_size)
-
-                        # Clamp font size to reasonable range
-                        font_size = max(6, min(72, font_size))
-
-                        # Position text at baseline
-                        # For ALL CAPS (no descenders), baseline is higher (~85%)
-                        # For normal text with descenders, baseline is lower (~80%)
-                        if is_all_caps(line_text) or not has_descenders(line_text):
-                            baseline_ratio = 0.85
-                        else:
-                            baseline_ratio = 0.80
-
-                        text_x = line_pdf_bbox.x0
-                        text_y = line_pdf_bbox.y0 + (line_pdf_bbox.height * baseline_ratio)
-
-                        try:
-                            new_page.insert_text(
-                                fitz.Point(text_x, text_y),
-                                line_text,
-                                fontname=pymupdf_font,
-                                fontsize=font_size,
-                                color=(0, 0, 0),
-                            )
-                        except Exception as e:
-                            print(f"[WARN] Failed to insert text '{line_text[:20]}...': {e}", file=sys.stderr)
-
-                    blocks_processed += 1
-
-                    # Store block metrics
-                    page_metrics['blocks'].append({
-                        'bbox_pdf': (pdf_bbox.x0, pdf_bbox.y0, pdf_bbox.x1, pdf_bbox.y1),
-                        'text': block['text'],
-                        'line_count': len(block['lines']),
-                    })
-
-                page_metrics['skipped_blocks'] = blocks_skipped
-                all_metrics['pages'].append(page_metrics)
-
-                print(f"[INFO]   Processed {blocks_processed} blocks, skipped {blocks_skipped}", file=sys.stderr)
+                if len(pending) >= 2 * workers:
+                    apply_next_result()
 
-            finally:
-                Path(tmp_path).unlink(missing_ok=True)
+            while pending:
+                apply_next_result()
 
         # Embed metrics in PDF metadata if requested
         if embed_metrics:
-            metrics_json = json.dumps(all_metrics)
+            metrics_json = _json_dumps(all_metrics)
             out_doc.set_metadata({
                 'keywords': f'tlacuilo_ocr_metrics:{metrics_json}'
             })
 
         # Save the output PDF
-        out_doc.save(output_path, garbage=4, deflate=True)
+        # Backgrounds are already JPEG; only text and metadata need deflate
+        out_doc.save(output_path, garbage=4, deflate=True, deflate_images=False)
         out_doc.close()
         doc.close()
 
@@ -778,6 +1325,13 @@ def run_editable_ocr(
         }
 
 
+def _json_dumps(obj) -> str:
+    """Compact JSON with orjson when installed, else the stdlib."""
+    if orjson is not None:
+        return orjson.dumps(obj).decode("utf-8")
+    return json.dumps(obj, separators=(",", ":"))
+
+
 def get_embedded_metrics(input_path: str) -> dict:
     """
     Extract embedded OCR metrics from a PDF.
@@ -829,11 +1383,12 @@ def main():
     # Analyze command
     analyze_parser = subparsers.add_parser("analyze", help="Analyze PDF for OCR needs")
     analyze_parser.add_argument("--input", required=True, help="Input PDF path")
+    analyze_parser.add_argument("--refresh", action="store_true", help="Ignore any cached analysis")
 
     # OCR command (searchable - invisible text layer)
     ocr_parser = subparsers.add_parser("ocr", help="Run OCR on PDF (searchable mode)")
-    ocr_parser.add_argument("--input", required=True, help="Input PDF path")
-    ocr_parser.add_argument("--output", required=True, help="Output PDF path")
+    ocr_parser.add_argument("--input", required=True, help="Input PDF path (- for stdin)")
+    ocr_parser.add_argument("--output", required=True, help="Output PDF path (- for stdout)")
     ocr_parser.add_argument("--language", default="eng", help="OCR language(s)")
     ocr_parser.add_argument("--deskew", action="store_true", help="Deskew pages")
     ocr_parser.add_argument("--rotate-pages", action="store_true", help="Auto-rotate pages")
@@ -843,6 +1398,9 @@ def main():
     ocr_parser.add_argument("--force-ocr", action="store_true", help="Force OCR")
     ocr_parser.add_argument("--redo-ocr", action="store_true", help="Redo existing OCR")
     ocr_parser.add_argument("--optimize", type=int, default=1, help="Optimization level 0-3")
+    ocr_parser.add_argument("--jobs", type=int, default=None, help="Pages to OCR in parallel (default: CPU count)")
+    ocr_parser.add_argument("--fast", action="store_true",
+                            help="With --optimize 0, run Tesseract directly instead of the ocrmypdf pipeline")
 
     # OCR Editable command (editable - real text objects with visual metrics)
     editable_parser = subparsers.add_parser("ocr-editable", help="Run editable OCR on PDF")
@@ -853,6 +1411,7 @@ def main():
     editable_parser.add_argument("--font-family", default="auto", help="Font family (auto, serif, sans-serif)")
     editable_parser.add_argument("--preserve-images", action="store_true", default=True, help="Preserve original images")
     editable_parser.add_argument("--embed-metrics", action="store_true", default=True, help="Embed OCR metrics in PDF")
+    editable_parser.add_argument("--jobs", type=int, default=None, help="Pages to OCR in parallel (default: CPU count)")
 
     # Get embedded metrics command
     metrics_parser = subparsers.add_parser("get-metrics", help="Get embedded OCR metrics from PDF")
@@ -863,7 +1422,7 @@ def main():
     if args.command == "check":
         result = check_dependencies()
     elif args.command == "analyze":
-        result = analyze_pdf(args.input)
+        result = analyze_pdf(args.input, force_refresh=args.refresh)
     elif args.command == "ocr":
         result = run_ocr(
             input_path=args.input,
@@ -877,6 +1436,8 @@ def main():
             force_ocr=args.force_ocr,
             redo_ocr=args.redo_ocr,
             optimize=args.optimize,
+            jobs=args.jobs,
+            fast_path=args.fast,
         )
     elif args.command == "ocr-editable":
         result = run_editable_ocr(
@@ -887,13 +1448,18 @@ def main():
             font_family=args.font_family,
             preserve_images=args.preserve_images,
             embed_metrics=args.embed_metrics,
+            jobs=args.jobs,
         )
     elif args.command == "get-metrics":
         result = get_embedded_metrics(args.input)
     else:
         result = {"error": f"Unknown command: {args.command}"}
 
-    print(json.dumps(result))
+    # stdout carries the PDF itself when --output is "-"
+    if args.command == "ocr" and args.output == "-":
+        print(json.dumps(result), file=sys.stderr)
+    else:
+        print(json.dumps(result))
 
 
 if __name__ == "__main__":
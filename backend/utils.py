@@ -2,11 +2,12 @@
 Shared utility functions for Tlacuilo backend.
 
 Provides common operations like path validation, temp file management,
-and system command detection.
+on-disk caches, and system command detection.
 """
 
 from __future__ import annotations
 
+import hashlib
 import os
 import shutil
 import tempfile
@@ -138,6 +139,23 @@ def ensure_output_dir(path: Path | str) -> Path:
     return p
 
 
+def is_same_file(a: Path | str, b: Path | str) -> bool:
+    """
+    Check whether two paths refer to the same existing file.
+
+    Args:
+        a: First path
+        b: Second path (may not exist yet)
+
+    Returns:
+        True if both exist and point at the same file, False otherwise.
+    """
+    try:
+        return os.path.samefile(a, b)
+    except OSError:
+        return False
+
+
 def get_temp_path(prefix: str = "tlacuilo", suffix: str = "") -> Path:
     """
     Generate a unique temporary file path.
@@ -271,3 +289,104 @@ def cleanup_temp_files(*paths: Path | str) -> None:
                     path.unlink()
         except OSError:
             pass  # Best effort cleanup
+
+
+def get_cache_dir(name: str) -> Path:
+    """
+    Get (and create) a per-feature cache directory.
+
+    Lives under $XDG_CACHE_HOME/tlacuilo (default ~/.cache/tlacuilo).
+
+    Args:
+        name: Subdirectory name (e.g., "text_blocks")
+
+    Returns:
+        Path to the cache directory.
+    """
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return ensure_output_dir(Path(base) / "tlacuilo" / name)
+
+
+def file_cache_key(path: Path | str, *parts: object) -> str:
+    """
+    Build a cache key that changes whenever the file changes.
+
+    Combines a hash of the resolved path with its mtime and size, so an
+    edited or replaced file never hits a stale entry.
+
+    Args:
+        path: Source file the cached data was derived from
+        parts: Extra key components (e.g., page number)
+
+    Returns:
+        Filename-safe key string.
+    """
+    p = Path(path).resolve()
+    stat = p.stat()
+    path_hash = hashlib.sha1(str(p).encode("utf-8")).hexdigest()[:16]
+    key = f"{path_hash}_{stat.st_mtime_ns}_{stat.st_size}"
+    for part in parts:
+        key += f"_{part}"
+    return key
+
+
+def write_cache_file(cache_file: Path | str, text: str) -> None:
+    """
+    Atomically replace a cache file with text.
+
+    Each writer stages into its own temp file next to the target, so
+    concurrent processes never rename or truncate each other's data; the
+    last replace wins. The temp file is removed if anything fails.
+
+    Args:
+        cache_file: Cache file to create or replace
+        text: Content to write (UTF-8)
+
+    Raises:
+        OSError: If the file cannot be written.
+    """
+    cache_file = Path(cache_file)
+    fd, tmp_name = tempfile.mkstemp(dir=cache_file.parent, prefix=f"{cache_file.stem}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as tmp:
+            tmp.write(text)
+        os.replace(tmp_name, cache_file)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except OSError:
+            pass
+        raise
+
+
+def prune_cache_dir(path: Path | str, max_bytes: int) -> None:
+    """
+    Delete least recently used files until a cache directory fits max_bytes.
+
+    Args:
+        path: Cache directory
+        max_bytes: Size budget in bytes
+    """
+    entries = []
+    total = 0
+    try:
+        for entry in os.scandir(path):
+            if entry.is_file():
+                stat = entry.stat()
+                entries.append((max(stat.st_atime, stat.st_mtime), stat.st_size, entry.path))
+                total += stat.st_size
+    except OSError:
+        return
+
+    if total <= max_bytes:
+        return
+
+    entries.sort()
+    for _, size, file_path in entries:
+        try:
+            os.unlink(file_path)
+        except OSError:
+            continue  # Best effort cleanup
+        total -= size
+        if total <= max_bytes:
+            break
@@ -0,0 +1,26 @@
+"""pdf_to_images must render real pages to image files."""
+
+import pytest
+
+fitz = pytest.importorskip("fitz")
+
+from backend.pdf_convert import pdf_to_images
+
+
+@pytest.mark.parametrize("fmt, magic", [("png", b"\x89PNG"), ("jpg", b"\xff\xd8\xff")])
+def test_renders_pages_to_files(tmp_path, fmt, magic):
+    pdf_path = tmp_path / "in.pdf"
+    doc = fitz.open()
+    for size in ((200, 100), (200, 100), (100, 300)):
+        page = doc.new_page(width=size[0], height=size[1])
+        page.insert_text((10, 50), "Hello", fontsize=20)
+    doc.save(pdf_path)
+    doc.close()
+
+    paths = pdf_to_images(pdf_path, tmp_path / "out", format=fmt, dpi=72)
+
+    assert [p.name for p in paths] == [f"page_000{n}.{fmt}" for n in (1, 2, 3)]
+    for path, (width, height) in zip(paths, ((200, 100), (200, 100), (100, 300))):
+        assert path.read_bytes().startswith(magic)
+        pix = fitz.Pixmap(str(path))
+        assert (pix.width, pix.height) == (width, height)
@@ -0,0 +1,69 @@
+"""Live preview must draw shapes and inserted text on top of replace_text redactions."""
+
+import pytest
+
+fitz = pytest.importorskip("fitz")
+
+from backend.pdf_edit import _apply_ops_to_page
+
+PAGE_W, PAGE_H = 200.0, 200.0
+RED = (255, 0, 0)
+
+
+def _page_with_text():
+    doc = fitz.open()
+    page = doc.new_page(width=PAGE_W, height=PAGE_H)
+    page.insert_text((20, 60), "Original text to replace", fontsize=12)
+    return doc, page
+
+
+def _rect(x0, y0, x1, y1):
+    return {
+        "x": x0 / PAGE_W,
+        "y": y0 / PAGE_H,
+        "width": (x1 - x0) / PAGE_W,
+        "height": (y1 - y0) / PAGE_H,
+    }
+
+
+def _replace_op():
+    # Covers the original line; the redaction extends below it
+    return {"type": "replace_text", "page": 0, "rect": _rect(10, 40, 190, 70), "text": ""}
+
+
+def _pixel(page, x, y):
+    pix = page.get_pixmap(colorspace=fitz.csRGB, clip=fitz.Rect(x, y, x + 1, y + 1))
+    return pix.pixel(0, 0)
+
+
+def test_shape_before_replace_stays_visible():
+    doc, page = _page_with_text()
+    shape_op = {
+        "type": "draw_shape",
+        "page": 0,
+        "shape": "rect",
+        "rect": _rect(30, 45, 80, 65),
+        "strokeColor": "#ff0000",
+        "fillColor": "#ff0000",
+    }
+
+    _apply_ops_to_page(page, [shape_op, _replace_op()], PAGE_W, PAGE_H)
+
+    assert _pixel(page, 55, 55) == RED
+    doc.close()
+
+
+def test_insert_before_replace_stays_visible():
+    doc, page = _page_with_text()
+    insert_op = {
+        "type": "insert_text",
+        "page": 0,
+        "rect": _rect(20, 45, 190, 65),
+        "text": "New",
+        "style": {"fontFamily": "helv", "fontSize": 12, "color": "#ff0000"},
+    }
+
+    _apply_ops_to_page(page, [insert_op, _replace_op()], PAGE_W, PAGE_H)
+
+    assert "New" in page.get_text()
+    doc.close()